@@ -54,6 +54,19 @@ MIDDLEWARE = [
 if os.getenv('ROLLBAR_ACCESS_TOKEN'):
     MIDDLEWARE.append('rollbar.contrib.django.middleware.RollbarNotifierMiddleware')
 
+# Async-версии страниц чтения (списки, карточка задачи) — для запуска
+# под ASGI (uvicorn). Под WSGI каждое async-представление выполнялось бы
+# в отдельном цикле событий, поэтому по умолчанию выключено.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False').lower() == 'true'
+
+# Заголовок Server-Timing и лог запросов/времени по каждому запросу.
+# Middleware синхронное: под ASGI оно переводит запрос в поток.
+REQUEST_TIMING = os.getenv('REQUEST_TIMING', str(DEBUG)).lower() == 'true'
+if REQUEST_TIMING:
+    MIDDLEWARE.insert(
+        0, 'task_manager.task_manager_app.middleware.RequestTimingMiddleware'
+    )
+
 
 ROOT_URLCONF = 'task_manager.urls'
 
@@ -61,8 +74,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'task_manager' / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # скомпилированные шаблоны хранятся в памяти процесса;
+            # TEMPLATE_WARMUP компилирует их при запуске воркера
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -73,11 +93,55 @@ TEMPLATES = [
     },
 ]
 
+# Компиляция всех шаблонов при загрузке wsgi.py/asgi.py, чтобы первый
+# запрос к новому воркеру не платил за разбор base.html и страниц
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', 'True').lower() == 'true'
+
+# Лента изменений задач (/api/tasks/changes/) не отдаёт изменения
+# моложе этого числа секунд: транзакция с более ранним updated_at может
+# завершиться позже, и клиент пропустил бы её
+SYNC_SETTLE_SECONDS = int(os.getenv('SYNC_SETTLE_SECONDS', 2))
+
+# События задач для потока SSE /tasks/events/ (только под ASGI).
+# InProcessBroker рассылает их в пределах процесса; для нескольких
+# воркеров нужен брокер с теми же методами поверх общего канала.
+TASK_EVENTS_BROKER = os.getenv(
+    'TASK_EVENTS_BROKER', 'task_manager.task_manager_app.events.InProcessBroker'
+)
+# секунд без событий до комментария, который держит соединение открытым
+TASK_EVENTS_KEEPALIVE = int(os.getenv('TASK_EVENTS_KEEPALIVE', 15))
+
 WSGI_APPLICATION = 'task_manager.wsgi.application'
 
+# Пул соединений PostgreSQL (psycopg 3, OPTIONS['pool'] в Django 5.1+):
+# соединения открываются заранее и общие для потоков воркера, новый
+# воркер не платит за подключение на первом запросе. С пулом Django
+# требует CONN_MAX_AGE=0.
+DB_POOL = os.getenv('DB_POOL', 'False').lower() == 'true'
+
+
+def database_config(url):
+    config = dj_database_url.parse(
+        url, conn_max_age=0 if DB_POOL else 600, conn_health_checks=True
+    )
+    if DB_POOL and config['ENGINE'] == 'django.db.backends.postgresql':
+        from psycopg_pool import ConnectionPool
+
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            # сколько ждать свободное соединение, прежде чем ошибка
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 600)),
+            # проверка соединения перед выдачей из пула
+            'check': ConnectionPool.check_connection,
+        }
+    return config
+
+
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL:
-    DATABASES = {'default': dj_database_url.config(conn_max_age=600)}
+    DATABASES = {'default': database_config(DATABASE_URL)}
 else:
     DATABASES = {
         'default': {
@@ -86,6 +150,104 @@ else:
         }
     }
 
+# Необязательная реплика для чтения: списки и карточки в GET-запросах
+# читаются с неё, запись и чтение после записи — с основной
+# базы (task_manager_app/routers.py).
+REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL')
+# Сколько секунд после записи браузер читает с основной базы
+# (допустимое отставание реплики)
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = database_config(REPLICA_DATABASE_URL)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = [
+        'task_manager.task_manager_app.routers.PrimaryReplicaRouter'
+    ]
+    MIDDLEWARE.insert(
+        0, 'task_manager.task_manager_app.middleware.ReplicaRoutingMiddleware'
+    )
+
+# Через кэш сбрасываются списки выбора и ETag задач, поэтому при
+# нескольких воркерах нужен общий кэш (REDIS_URL).
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Списки выбора статусов, меток и пользователей для форм и фильтров.
+# Сигнал сбрасывает кэш только в своём процессе, поэтому с LocMemCache
+# записи живут недолго: новые объекты из другого воркера появляются в
+# списках через несколько секунд, а не через час.
+CHOICES_CACHE_TIMEOUT = int(os.getenv(
+    'CHOICES_CACHE_TIMEOUT', 60 * 60 if REDIS_URL else 10
+))
+
+# Строки списка задач кэшируются целиком; ключ меняется при изменении
+# задачи, статуса или пользователей (task_manager_app/fragments.py).
+# Версии статусов и пользователей меняются в кэше; с LocMemCache
+# остальные воркеры показывали бы старые имена до истечения срока,
+# поэтому без REDIS_URL строки не кэшируются (0 — не кэшировать).
+TASK_ROW_CACHE_TIMEOUT = int(os.getenv(
+    'TASK_ROW_CACHE_TIMEOUT', 60 * 60 * 24 if REDIS_URL else 0
+))
+
+# ETag и Last-Modified API задач считаются по версии данных в кэше
+# (task_manager_app/etags.py). С LocMemCache остальные воркеры не узнали
+# бы об изменении и отвечали бы 304 со старыми данными, поэтому без
+# REDIS_URL условные запросы выключены.
+TASKS_CONDITIONAL_GET = os.getenv(
+    'TASKS_CONDITIONAL_GET', str(bool(REDIS_URL))
+).lower() == 'true'
+
+# При общем кэше (REDIS_URL) пользователь сессии берётся из кэша
+# (task_manager_app/backends.py); запись сбрасывается при сохранении
+# пользователя. С LocMemCache сброс дошёл бы только до своего воркера,
+# и в остальных смена пароля и блокировка не действовали бы до истечения
+# записи, поэтому тогда пользователь читается из базы.
+AUTHENTICATION_BACKENDS = [
+    'task_manager.task_manager_app.backends.CachedModelBackend'
+    if REDIS_URL else 'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', 60 * 60))
+
+# Хранилище сессий (SESSION_STORAGE):
+#   db             — строка в django_session на каждый запрос;
+#   cached_db      — чтение из кэша, в базу только запись. Нужен общий
+#                    кэш: с LocMemCache другой воркер увидит устаревшую
+#                    сессию (например, уже завершённую выходом);
+#   signed_cookies — сессия целиком в подписанной cookie, без базы; выход
+#                    не отзывает украденную cookie до истечения срока.
+# По умолчанию cached_db при общем кэше (REDIS_URL), иначе db.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_STORAGE = os.getenv(
+    'SESSION_STORAGE', 'cached_db' if REDIS_URL else 'db'
+)
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORAGE]
+
+# Хранилище сообщений (MESSAGE_STORAGE): fallback — cookie, а при
+# переполнении сессия; cookie — только cookie, сессия не читается
+# и не пишется ради сообщений.
+MESSAGE_STORAGES = {
+    'fallback': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    'cookie': 'django.contrib.messages.storage.cookie.CookieStorage',
+    'session': 'django.contrib.messages.storage.session.SessionStorage',
+}
+MESSAGE_STORAGE = MESSAGE_STORAGES[os.getenv('MESSAGE_STORAGE', 'fallback')]
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -104,22 +266,52 @@ LOCALE_PATHS = [BASE_DIR / 'locale']
 
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-if not DEBUG:
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Bootstrap лежит в static/vendor: collectstatic добавляет к именам хэш
+# и сжимает файлы в .gz и .br (если установлен Brotli), WhiteNoise отдаёт
+# файлы с хэшем с Cache-Control immutable. Тесты collectstatic не
+# запускают, поэтому манифест в них не используется.
+STATIC_MANIFEST = not DEBUG and 'test' not in sys.argv and 'pytest' not in sys.modules
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
 
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'task_manager.timing': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_TIMING_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
 
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# rollbar импортирует и инициализирует RollbarNotifierMiddleware при
+# загрузке обработчика запросов: командам manage.py он не нужен, а его
+# импорт (вместе с requests) — самая долгая часть settings.py
 ROLLBAR_TOKEN = os.getenv('ROLLBAR_ACCESS_TOKEN')
 if ROLLBAR_TOKEN and 'test' not in sys.argv:
-    import rollbar
     ROLLBAR = {
         'access_token': ROLLBAR_TOKEN,
         'environment': 'development' if DEBUG else 'production',
         'code_version': '1.0',
-        'root': BASE_DIR,
+        'root': str(BASE_DIR),
     }
-    rollbar.init(**ROLLBAR)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TaskManagerAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'task_manager.task_manager_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
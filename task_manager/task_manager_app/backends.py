@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+CACHE_KEY = 'auth:user:{}'
+
+
+def user_cache_key(user_id):
+    return CACHE_KEY.format(user_id)
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, который берёт пользователя сессии из кэша, а не из
+    auth_user на каждом запросе. Сессия хранит id пользователя, поэтому
+    ключ кэша — id: одна запись на пользователя, сколько бы у него ни
+    было сессий. Запись сбрасывается сигналом при сохранении и удалении
+    пользователя, в том числе при смене пароля — иначе проверка хэша
+    сессии шла бы по старому паролю. Нужен общий для воркеров кэш.
+    """
+
+    def users(self):
+        # в кэш на час не должно попасть отставание реплики
+        return get_user_model()._default_manager.using(DEFAULT_DB_ALIAS)
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = self.users().filter(pk=user_id).first()
+            if user is None:
+                return None
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await self.users().filter(pk=user_id).afirst()
+            if user is None:
+                return None
+            await cache.aset(key, user, settings.USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
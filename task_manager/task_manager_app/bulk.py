@@ -0,0 +1,145 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import counters, events
+from .etags import touch_tasks_version
+from .models import Task, TaskCounter
+
+SET_STATUS = 'set_status'
+SET_EXECUTOR = 'set_executor'
+ADD_LABELS = 'add_labels'
+REMOVE_LABELS = 'remove_labels'
+
+# Сколько id задач передаётся в одном запросе: списки IN остаются
+# в пределах ограничения SQLite на число параметров
+BATCH_SIZE = 500
+
+COUNTED_FIELDS = {
+    'status': TaskCounter.STATUS,
+    'executor': TaskCounter.EXECUTOR,
+}
+
+
+def batches(ids):
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def lock_task_ids(tasks):
+    """
+    id задач выборки. В PostgreSQL строки блокируются до конца
+    транзакции, чтобы параллельное изменение задачи не разошлось
+    со счётчиками, посчитанными по прежним значениям.
+    """
+    return list(
+        tasks.select_for_update(of=('self',))
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+
+
+def mark_changed(task_ids, deltas):
+    """
+    То, что при save() делают сигналы: updated_at для ленты изменений
+    и кэша строк, счётчики, версия списка задач и события SSE.
+    """
+    if not task_ids:
+        return
+    now = timezone.now()
+    for chunk in batches(task_ids):
+        Task.objects.filter(pk__in=chunk).update(updated_at=now)
+    counters.apply_deltas(deltas)
+    touch_tasks_version()
+    for pk in task_ids:
+        events.publish_task_event(events.UPDATED, pk)
+
+
+def set_field(tasks, field, value):
+    kind = COUNTED_FIELDS[field]
+    new_id = value.pk if value is not None else None
+    changed = []
+    deltas = Counter()
+    for chunk in batches(lock_task_ids(tasks)):
+        rows = list(
+            Task.objects.filter(pk__in=chunk)
+            .exclude(**{field: value})
+            .order_by('pk')
+            .values_list('pk', f'{field}_id')
+        )
+        if not rows:
+            continue
+        Task.objects.filter(pk__in=[pk for pk, _ in rows]).update(
+            **{field: value}
+        )
+        changed += [pk for pk, _ in rows]
+        deltas.subtract(
+            (kind, old_id) for _, old_id in rows if old_id is not None
+        )
+        if new_id is not None:
+            deltas[(kind, new_id)] += len(rows)
+    mark_changed(changed, deltas)
+    return len(changed)
+
+
+@transaction.atomic
+def set_status(tasks, status):
+    """Переводит задачи в статус; возвращает число изменённых"""
+    return set_field(tasks, 'status', status)
+
+
+@transaction.atomic
+def set_executor(tasks, executor):
+    """Назначает исполнителя (None — снимает); возвращает число изменённых"""
+    return set_field(tasks, 'executor', executor)
+
+
+@transaction.atomic
+def add_labels(tasks, labels):
+    """Добавляет метки задачам, у которых их ещё нет"""
+    Link = Task.labels.through
+    label_ids = [label.pk for label in labels]
+    changed = set()
+    new_links = []
+    for chunk in batches(lock_task_ids(tasks)):
+        existing = set(
+            Link.objects.filter(task_id__in=chunk, label_id__in=label_ids)
+            .values_list('task_id', 'label_id')
+        )
+        for task_id in chunk:
+            for label_id in label_ids:
+                if (task_id, label_id) not in existing:
+                    new_links.append(Link(task_id=task_id, label_id=label_id))
+                    changed.add(task_id)
+    Link.objects.bulk_create(new_links, batch_size=BATCH_SIZE)
+    deltas = Counter(counters.label_keys(link.label_id for link in new_links))
+    mark_changed(sorted(changed), deltas)
+    return len(changed)
+
+
+@transaction.atomic
+def remove_labels(tasks, labels):
+    """Снимает метки с задач"""
+    Link = Task.labels.through
+    label_ids = [label.pk for label in labels]
+    changed = set()
+    deltas = Counter()
+    for chunk in batches(lock_task_ids(tasks)):
+        links = Link.objects.filter(task_id__in=chunk, label_id__in=label_ids)
+        removed = list(links.values_list('task_id', 'label_id'))
+        if not removed:
+            continue
+        links.delete()
+        changed.update(task_id for task_id, _ in removed)
+        deltas.subtract(counters.label_keys(label_id for _, label_id in removed))
+    mark_changed(sorted(changed), deltas)
+    return len(changed)
+
+
+ACTIONS = {
+    SET_STATUS: (set_status, 'status'),
+    SET_EXECUTOR: (set_executor, 'executor'),
+    ADD_LABELS: (add_labels, 'labels'),
+    REMOVE_LABELS: (remove_labels, 'labels'),
+}
@@ -0,0 +1,152 @@
+import sys
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan, StartsWith
+from django.forms.models import ModelChoiceIterator
+
+
+CACHE_KEY = 'choices:{}'
+LABEL_CACHE_KEY = 'choices:{}:{}'
+
+
+def user_label(user):
+    return user.get_full_name() or user.username
+
+
+# Подпись варианта в выпадающем списке для моделей,
+# у которых __str__ не подходит.
+CHOICE_LABELS = {
+    User: user_label,
+}
+
+
+def cache_key(model):
+    return CACHE_KEY.format(model._meta.label_lower)
+
+
+def label_cache_key(model, pk):
+    return LABEL_CACHE_KEY.format(model._meta.label_lower, pk)
+
+
+def get_choices(model):
+    """Список (pk, подпись) для модели из кэша или из базы"""
+    key = cache_key(model)
+    choices = cache.get(key)
+    if choices is None:
+        label = CHOICE_LABELS.get(model, str)
+        # в кэш на час не должно попасть отставание реплики
+        objects = model._default_manager.using(DEFAULT_DB_ALIAS)
+        choices = [(obj.pk, label(obj)) for obj in objects.all()]
+        cache.set(key, choices, settings.CHOICES_CACHE_TIMEOUT)
+    return choices
+
+
+def get_labels(model, pks):
+    """
+    Подписи {pk: подпись} только для переданных объектов: из кэша,
+    недостающие — одним запросом. Работа не зависит от числа всех
+    объектов модели, в отличие от get_choices.
+    """
+    keys = {label_cache_key(model, pk): pk for pk in pks}
+    labels = {keys[key]: text for key, text in cache.get_many(keys).items()}
+    missing = [pk for pk in keys.values() if pk not in labels]
+    if missing:
+        label = CHOICE_LABELS.get(model, str)
+        objects = model._default_manager.using(DEFAULT_DB_ALIAS)
+        fresh = {obj.pk: label(obj) for obj in objects.filter(pk__in=missing)}
+        cache.set_many(
+            {label_cache_key(model, pk): text for pk, text in fresh.items()},
+            settings.CHOICES_CACHE_TIMEOUT,
+        )
+        labels.update(fresh)
+    return labels
+
+
+def invalidate_choices(model, pk=None):
+    keys = [cache_key(model)]
+    if pk is not None:
+        keys.append(label_cache_key(model, pk))
+    cache.delete_many(keys)
+
+
+def next_prefix(prefix):
+    """
+    Наименьшая строка больше всех строк, начинающихся с prefix, или
+    None, если такой нет (prefix из одних максимальных символов).
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    if 0xD800 <= code <= 0xDFFF:
+        # суррогаты не кодируются в UTF-8
+        code = 0xE000
+    return prefix[:-1] + chr(code)
+
+
+# LOWER в SQLite приводит к нижнему регистру только ASCII
+ASCII_LOWER = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'
+)
+
+
+def case_variants(prefix, vendor):
+    """
+    Формы префикса для сравнения с LOWER(field). В PostgreSQL LOWER
+    понимает любые буквы, и хватает prefix.lower(). В SQLite остальные
+    буквы остаются как есть, поэтому префикс ищется и с заглавной, и
+    целиком заглавным: «имя» находит «Имя» и «ИМЯ».
+    """
+    if vendor != 'sqlite':
+        return [prefix.lower()]
+    variants = (prefix.lower(), prefix.capitalize(), prefix.upper())
+    return list(dict.fromkeys(
+        variant.translate(ASCII_LOWER) for variant in variants
+    ))
+
+
+def prefix_q(field, prefix, vendor):
+    """
+    Поиск по префиксу без учёта регистра диапазоном
+    [prefix, следующий префикс) по LOWER(field). Диапазон использует
+    индекс по выражению LOWER(field) и в SQLite, и в PostgreSQL;
+    startswith отсекает лишнее при нестандартной сортировке строк.
+    """
+    value = Lower(field)
+    condition = Q()
+    for variant in case_variants(prefix, vendor):
+        conditions = [
+            GreaterThanOrEqual(value, variant), StartsWith(value, variant)
+        ]
+        upper = next_prefix(variant)
+        if upper is not None:
+            conditions.append(LessThan(value, upper))
+        condition |= Q(*conditions)
+    return condition
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """
+    Отдаёт варианты выбора из кэша вместо запроса к queryset поля.
+    Подходит только для полей, чей queryset совпадает со всеми
+    объектами модели; проверка значения по-прежнему идёт через queryset.
+    """
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_choices(self.queryset.model)
+
+    def __len__(self):
+        empty = 1 if self.field.empty_label is not None else 0
+        return len(get_choices(self.queryset.model)) + empty
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(
+            get_choices(self.queryset.model)
+        )
@@ -0,0 +1,122 @@
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count, F
+
+from .choices import get_labels
+from .models import Label, Status, Task, TaskCounter
+
+# PostgreSQL: на время пересчёта запрещаем запись в задачи, иначе
+# изменения, пришедшие между агрегацией и вставкой, потеряются.
+# SQLite и так сериализует запись.
+POSTGRES_LOCK = (
+    'LOCK TABLE task_manager_app_task, task_manager_app_task_labels '
+    'IN SHARE MODE'
+)
+
+
+def task_keys(status_id, executor_id):
+    keys = [(TaskCounter.STATUS, status_id)]
+    if executor_id is not None:
+        keys.append((TaskCounter.EXECUTOR, executor_id))
+    return keys
+
+
+def label_keys(label_ids):
+    return [(TaskCounter.LABEL, label_id) for label_id in label_ids]
+
+
+def apply_deltas(deltas):
+    """
+    Прибавляет к счётчикам изменения {(kind, object_id): delta}.
+    Вызывается из сигналов внутри транзакции изменения задачи.
+    QuerySet.update и bulk_create сигналов не отправляют — такой код
+    передаёт свои изменения сюда сам или вызывает rebuild_counters.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        TaskCounter.objects.bulk_create(
+            [TaskCounter(kind=kind, object_id=pk) for kind, pk in deltas],
+            ignore_conflicts=True,
+        )
+        # одинаковый порядок блокировок у параллельных транзакций
+        for (kind, pk), delta in sorted(deltas.items()):
+            TaskCounter.objects.filter(kind=kind, object_id=pk).update(
+                count=F('count') + delta
+            )
+
+
+def count_new_tasks(tasks, task_labels=()):
+    """Изменения счётчиков для задач, созданных через bulk_create"""
+    deltas = Counter()
+    for task in tasks:
+        deltas.update(task_keys(task.status_id, task.executor_id))
+    for label_ids in task_labels:
+        deltas.update(label_keys(label_ids))
+    return deltas
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Пересчитывает все счётчики по таблице задач"""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(POSTGRES_LOCK)
+    rows = []
+    for kind, field in (
+        (TaskCounter.STATUS, 'status'),
+        (TaskCounter.EXECUTOR, 'executor'),
+    ):
+        grouped = Task.objects.filter(**{f'{field}__isnull': False}).values(
+            field
+        ).annotate(total=Count('pk')).order_by()
+        rows += [
+            TaskCounter(kind=kind, object_id=row[field], count=row['total'])
+            for row in grouped
+        ]
+    grouped = Task.labels.through.objects.values('label').annotate(
+        total=Count('pk')
+    ).order_by()
+    rows += [
+        TaskCounter(
+            kind=TaskCounter.LABEL, object_id=row['label'], count=row['total']
+        )
+        for row in grouped
+    ]
+    TaskCounter.objects.all().delete()
+    TaskCounter.objects.bulk_create(rows)
+    return len(rows)
+
+
+def task_dashboard():
+    """
+    Счётчики для главной страницы: один запрос к TaskCounter,
+    подписи берутся из кэша только для посчитанных объектов.
+    """
+    counts = {kind: {} for kind, _ in TaskCounter.KINDS}
+    for kind, object_id, count in TaskCounter.objects.filter(
+        count__gt=0
+    ).values_list('kind', 'object_id', 'count'):
+        counts[kind][object_id] = count
+
+    def rows(kind, model):
+        labels = get_labels(model, counts[kind])
+        return sorted(
+            (
+                (labels[pk], count)
+                for pk, count in counts[kind].items() if pk in labels
+            ),
+            key=lambda row: (-row[1], row[0]),
+        )
+
+    total = sum(counts[TaskCounter.STATUS].values())
+    return {
+        'total': total,
+        'unassigned': total - sum(counts[TaskCounter.EXECUTOR].values()),
+        'statuses': rows(TaskCounter.STATUS, Status),
+        'executors': rows(TaskCounter.EXECUTOR, User),
+        'labels': rows(TaskCounter.LABEL, Label),
+    }
@@ -0,0 +1,47 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'tasks:version'
+
+
+def get_tasks_version():
+    """
+    Момент последнего изменения данных, которые видны в задачах.
+    Если ключа нет (новый процесс, вытеснение), отсчёт начинается
+    заново — это только сбрасывает клиентские кэши.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time()
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def touch_tasks_version():
+    """
+    Новая версия после фиксации транзакции: раньше опрос получил бы
+    новый ETag со старыми данными и затем 304 до следующего изменения.
+    """
+    transaction.on_commit(
+        lambda: cache.set(VERSION_KEY, time.time(), None)
+    )
+
+
+def tasks_etag(request, *args, **kwargs):
+    # None — condition() отдаёт ответ без валидаторов
+    if not settings.TASKS_CONDITIONAL_GET:
+        return None
+    key = f'{get_tasks_version()}:{request.user.pk}:{request.get_full_path()}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def tasks_last_modified(request, *args, **kwargs):
+    if not settings.TASKS_CONDITIONAL_GET:
+        return None
+    return datetime.fromtimestamp(get_tasks_version(), tz=timezone.utc)
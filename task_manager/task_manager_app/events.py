@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+class Subscription:
+    """Очередь событий одного открытого потока SSE"""
+
+    def __init__(self, broker, maxsize):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        # подписчик не успевал читать, и часть событий потеряна
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        """Следующая пачка событий: всё, что накопилось в очереди"""
+        events = [await self.queue.get()]
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """
+    Рассылает события задач подписчикам своего процесса. Публиковать
+    можно из любого потока, подписываться — из цикла событий.
+    При нескольких воркерах каждый видит только изменения, сделанные
+    им самим; тогда TASK_EVENTS_BROKER указывает на класс с теми же
+    методами publish/subscribe поверх общего канала (Redis pub/sub,
+    LISTEN/NOTIFY в PostgreSQL).
+    """
+
+    def __init__(self, maxsize=100):
+        self.maxsize = maxsize
+        self.subscriptions = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        subscription = Subscription(self, self.maxsize)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # цикл событий уже закрыт, поток SSE завершился
+                self.unsubscribe(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.TASK_EVENTS_BROKER)()
+
+
+def publish_task_event(kind, pk):
+    """Отправляет событие после фиксации транзакции"""
+    transaction.on_commit(
+        lambda: get_broker().publish({'type': kind, 'id': pk})
+    )
+
+
+def coalesce(events):
+    """
+    Сводит пачку событий к одному на задачу: удаление и последующее
+    состояние важнее промежуточных изменений, созданная и сразу
+    изменённая задача остаётся созданной.
+    """
+    merged = {}
+    for event in events:
+        kind, pk = event['type'], event['id']
+        if kind == UPDATED and merged.get(pk) == CREATED:
+            continue
+        merged.pop(pk, None)
+        merged[pk] = kind
+    return merged
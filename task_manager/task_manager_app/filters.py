@@ -3,29 +3,61 @@ from django import forms
 from django.contrib.auth.models import User
 from django.utils.translation import gettext_lazy as _
 
+from .choices import CachedModelChoiceIterator, user_label
 from .models import Task, Status, Label
+from .search import search_tasks
+from .widgets import AutocompleteSelect
+
+
+class CachedModelChoiceField(django_filters.fields.ModelChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+class CachedModelChoiceFilter(django_filters.ModelChoiceFilter):
+    field_class = CachedModelChoiceField
+
+
+class UserChoiceField(CachedModelChoiceField):
+
+    def label_from_instance(self, obj):
+        return user_label(obj)
+
+
+class UserChoiceFilter(CachedModelChoiceFilter):
+    field_class = UserChoiceField
 
 
 class TaskFilter(django_filters.FilterSet):
 
-    status = django_filters.ModelChoiceFilter(
+    q = django_filters.CharFilter(
+        method='filter_search',
+        label=_("Поиск"),
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+
+    status = CachedModelChoiceFilter(
         queryset=Status.objects.all(),
         label=_("Статус"),
         empty_label="---------",
         widget=forms.Select(attrs={'class': 'form-select'})
     )
 
-    executor = django_filters.ModelChoiceFilter(
+    executor = UserChoiceFilter(
         queryset=User.objects.all(),
         label=_("Исполнитель"),
-        widget=forms.Select(attrs={'class': 'form-select'})
+        empty_label="---------",
+        widget=AutocompleteSelect(
+            'users_autocomplete', attrs={'class': 'form-select'}
+        )
     )
 
-    labels = django_filters.ModelChoiceFilter(
+    labels = CachedModelChoiceFilter(
         queryset=Label.objects.all(),
         label=_("Метка"),
         empty_label="---------",
-        widget=forms.Select(attrs={'class': 'form-select'})
+        widget=AutocompleteSelect(
+            'labels_autocomplete', attrs={'class': 'form-select'}
+        )
     )
 
     self_tasks = django_filters.BooleanFilter(
@@ -34,12 +66,6 @@ class TaskFilter(django_filters.FilterSet):
         widget=forms.CheckboxInput()
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        executor_field = self.filters['executor'].field
-        executor_field.label_from_instance = lambda obj: obj.get_full_name()
-        executor_field.empty_label = "---------"
-
     class Meta:
         model = Task
         fields = ['status', 'executor', 'labels']
@@ -47,4 +73,7 @@ class TaskFilter(django_filters.FilterSet):
     def filter_author_tasks(self, queryset, name, value):
         if value and self.request.user.is_authenticated:
             return queryset.filter(author=self.request.user)
-        return queryset
\ No newline at end of file
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search_tasks(queryset, value)
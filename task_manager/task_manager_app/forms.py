@@ -3,10 +3,21 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
+from . import bulk
+from .choices import CachedModelChoiceIterator
 from .models import Status, Task, Label
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
-class UserChoiceField(forms.ModelChoiceField):
+class CachedModelChoiceField(forms.ModelChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+class CachedModelMultipleChoiceField(forms.ModelMultipleChoiceField):
+    iterator = CachedModelChoiceIterator
+
+
+class UserChoiceField(CachedModelChoiceField):
 
     def label_from_instance(self, obj):
         full_name = obj.get_full_name()
@@ -178,16 +189,25 @@ class StatusForm(forms.ModelForm):
 
 
 class TaskForm(forms.ModelForm):
+    status = CachedModelChoiceField(
+        queryset=Status.objects.all(),
+        label=_('Статус'),
+        widget=forms.Select(attrs={'class': 'form-select'}))
+
     executor = UserChoiceField(
         queryset=User.objects.all(),
         required=False,
         label=_('Исполнитель'),
-        widget=forms.Select(attrs={'class': 'form-select'}))
+        widget=AutocompleteSelect(
+            'users_autocomplete', attrs={'class': 'form-select'}
+        ))
 
-    labels = forms.ModelMultipleChoiceField(
+    labels = CachedModelMultipleChoiceField(
         queryset=Label.objects.all(),
         required=False,
-        widget=forms.SelectMultiple(attrs={'class': 'form-select'}),
+        widget=AutocompleteSelectMultiple(
+            'labels_autocomplete', attrs={'class': 'form-select'}
+        ),
         label=_('Метки')
     )
 
@@ -201,7 +221,6 @@ class TaskForm(forms.ModelForm):
             'description': forms.Textarea(attrs={
                 'class': 'form-control', 'rows': 4, 'placeholder': _('Описание')
             }),
-            'status': forms.Select(attrs={'class': 'form-select'}),
         }
         labels = {
             'name': _('Имя'),
@@ -215,6 +234,81 @@ class TaskForm(forms.ModelForm):
         self.fields['executor'].empty_label = "---------"
 
 
+class TaskIdsField(forms.Field):
+    """Список id задач из отмеченных в таблице флажков"""
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return [int(pk) for pk in value or []]
+        except (TypeError, ValueError):
+            raise ValidationError(_('Некорректный список задач'))
+
+
+class TaskBulkForm(forms.Form):
+    action = forms.ChoiceField(
+        choices=[
+            (bulk.SET_STATUS, _('Сменить статус')),
+            (bulk.SET_EXECUTOR, _('Назначить исполнителя')),
+            (bulk.ADD_LABELS, _('Добавить метки')),
+            (bulk.REMOVE_LABELS, _('Снять метки')),
+        ],
+        label=_('Действие'),
+        widget=forms.Select(attrs={'class': 'form-select'}))
+
+    status = CachedModelChoiceField(
+        queryset=Status.objects.all(),
+        required=False,
+        label=_('Статус'),
+        widget=forms.Select(attrs={'class': 'form-select'}))
+
+    executor = UserChoiceField(
+        queryset=User.objects.all(),
+        required=False,
+        label=_('Исполнитель'),
+        widget=AutocompleteSelect(
+            'users_autocomplete', attrs={'class': 'form-select'}
+        ))
+
+    labels = CachedModelMultipleChoiceField(
+        queryset=Label.objects.all(),
+        required=False,
+        label=_('Метки'),
+        widget=AutocompleteSelectMultiple(
+            'labels_autocomplete', attrs={'class': 'form-select'}
+        ))
+
+    tasks = TaskIdsField(required=False)
+
+    select_all = forms.BooleanField(
+        required=False,
+        label=_('Все задачи по фильтру'),
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}))
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('prefix', 'bulk')
+        super().__init__(*args, **kwargs)
+        self.fields['executor'].empty_label = "---------"
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get('action')
+        if action == bulk.SET_STATUS and not cleaned_data.get('status'):
+            self.add_error('status', _('Выберите статус'))
+        if action in (bulk.ADD_LABELS, bulk.REMOVE_LABELS) and not (
+            cleaned_data.get('labels')
+        ):
+            self.add_error('labels', _('Выберите метки'))
+        if not cleaned_data.get('tasks') and not cleaned_data.get('select_all'):
+            raise ValidationError(_('Не выбрано ни одной задачи'))
+        return cleaned_data
+
+    def apply(self, tasks):
+        """Выполняет действие над задачами; возвращает число изменённых"""
+        perform, field = bulk.ACTIONS[self.cleaned_data['action']]
+        return perform(tasks, self.cleaned_data[field])
+
+
 class LabelForm(forms.ModelForm):
     class Meta:
         model = Label
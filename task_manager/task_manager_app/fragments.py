@@ -0,0 +1,39 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Status
+
+VERSION_KEY = 'fragments:{}'
+
+# Модели, данные которых выводятся в строке списка задач
+ROW_MODELS = (Status, User)
+
+
+def version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def get_row_version():
+    """
+    Общая часть ключа кэша строк задач: версии связанных моделей,
+    одним обращением к кэшу. Своя часть строки — updated_at задачи —
+    добавляется в шаблоне.
+    """
+    keys = [version_key(model) for model in ROW_MODELS]
+    versions = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return ':'.join(str(versions[key]) for key in keys)
+
+
+def touch_row_version(model):
+    # после фиксации: иначе параллельный запрос закэширует под новой
+    # версией строку со старыми данными
+    transaction.on_commit(
+        lambda: cache.set(version_key(model), time.time(), None)
+    )
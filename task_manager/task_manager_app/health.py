@@ -0,0 +1,31 @@
+import time
+
+from django.db import DatabaseError, connections
+
+
+def pool_stats(connection):
+    """Счётчики пула psycopg (get_stats) или None, если пула нет"""
+    pool = getattr(connection, 'pool', None)
+    return pool.get_stats() if pool is not None else None
+
+
+def check_databases():
+    """Проверяет каждую базу запросом SELECT 1"""
+    report = {}
+    for connection in connections.all():
+        started = time.perf_counter()
+        error = None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except DatabaseError as exc:
+            # текст ошибки может содержать адрес базы — отдаём только тип
+            error = type(exc).__name__
+        report[connection.alias] = {
+            'ok': error is None,
+            'error': error,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+            'pool': pool_stats(connection),
+        }
+    return report
@@ -0,0 +1,129 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode, urljoin
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchmark_views import percentile
+
+PATHS = ['/tasks/', '/statuses/', '/labels/', '/users/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенный сервер параллельными GET-запросами и '
+        'выводит пропускную способность и задержки. Запускается по '
+        'очереди против gunicorn (WSGI) и uvicorn (ASGI, ASYNC_VIEWS=true).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', default='password')
+        parser.add_argument('--paths', nargs='+', default=PATHS)
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[1, 8, 32],
+            help='Уровни параллелизма.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Запросов на каждый адрес и уровень параллелизма.'
+        )
+        parser.add_argument(
+            '--save', help='Сохранить результаты в JSON-файл.'
+        )
+        parser.add_argument(
+            '--compare', help='Сравнить с результатами из JSON-файла.'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or min(options['concurrency']) < 1:
+            raise CommandError('Число запросов и потоков должно быть > 0')
+        opener = self.login(options)
+        results = {}
+        for path in options['paths']:
+            url = urljoin(options['url'], path)
+            for workers in options['concurrency']:
+                results[f'{path} x{workers}'] = self.measure(
+                    opener, url, workers, options['requests']
+                )
+
+        baseline = {}
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+        self.report(results, baseline)
+        if options['save']:
+            Path(options['save']).write_text(
+                json.dumps(results, indent=2) + '\n'
+            )
+            self.stdout.write(f'Результаты сохранены: {options["save"]}')
+
+    def login(self, options):
+        cookies = CookieJar()
+        opener = build_opener(HTTPCookieProcessor(cookies))
+        login_url = urljoin(options['url'], '/login/')
+        try:
+            opener.open(login_url).read()
+        except URLError as error:
+            raise CommandError(f'Сервер недоступен: {error}')
+        token = next(
+            (c.value for c in cookies if c.name == 'csrftoken'), ''
+        )
+        data = urlencode({
+            'username': options['username'],
+            'password': options['password'],
+            'csrfmiddlewaretoken': token,
+        }).encode()
+        opener.open(Request(
+            login_url, data=data, headers={'Referer': login_url}
+        )).read()
+        if not any(c.name == 'sessionid' for c in cookies):
+            raise CommandError('Не удалось войти: проверьте логин и пароль')
+        return opener
+
+    def measure(self, opener, url, workers, count):
+        def fetch(_):
+            started = time.perf_counter()
+            try:
+                with opener.open(url) as response:
+                    response.read()
+                    status = response.status
+            except HTTPError as error:
+                status = error.code
+            return status, (time.perf_counter() - started) * 1000
+
+        # прогрев: соединения с базой и кэши воркеров
+        list(map(fetch, range(workers)))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            responses = list(pool.map(fetch, range(count)))
+        elapsed = time.perf_counter() - started
+
+        timings = [timing for _, timing in responses]
+        return {
+            'errors': sum(status >= 400 for status, _ in responses),
+            'rps': round(count / elapsed, 1),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+        }
+
+    def report(self, results, baseline):
+        self.stdout.write(
+            f'{"запрос":<20} {"rps":>8} {"p50 ms":>9} {"p95 ms":>9} '
+            f'{"ошибок":>6}  сравнение'
+        )
+        for name, result in results.items():
+            before = baseline.get(name)
+            note = '—'
+            if before and before['rps']:
+                note = f'rps ×{result["rps"] / before["rps"]:.2f}'
+            self.stdout.write(
+                f'{name:<20} {result["rps"]:>8} {result["p50_ms"]:>9} '
+                f'{result["p95_ms"]:>9} {result["errors"]:>6}  {note}'
+            )
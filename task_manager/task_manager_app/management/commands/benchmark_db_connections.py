@@ -0,0 +1,143 @@
+import json
+import statistics
+import threading
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from task_manager.task_manager_app.health import pool_stats
+
+from .benchmark_views import percentile
+
+
+def acquire_connections(alias, threads, iterations):
+    """
+    Один воркер: threads потоков повторяют цикл запроса — получить
+    соединение, выполнить SELECT 1 и отпустить его, как это делает
+    Django по сигналу request_finished. Первое получение в потоке
+    (холодное) считается отдельно от остальных.
+    """
+    cold, warm = [], []
+    lock = threading.Lock()
+
+    def run():
+        connection = connections[alias]
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            connection.ensure_connection()
+            timings.append((time.perf_counter() - started) * 1000)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            close_old_connections()
+        connection.close()
+        with lock:
+            cold.append(timings[0])
+            warm.extend(timings[1:])
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return cold, warm, pool_stats(connections[alias])
+
+
+def summary(timings):
+    if not timings:
+        return None
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет задержку получения соединения с базой при нескольких '
+        'воркерах-процессах с потоками. Запускается с DB_POOL=true и без '
+        'него, чтобы сравнить пул psycopg с CONN_MAX_AGE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument(
+            '--iterations', type=int, default=200,
+            help='Циклов «запроса» на каждый поток.'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--save', help='Сохранить результаты в JSON-файл.'
+        )
+        parser.add_argument(
+            '--compare', help='Сравнить с результатами из JSON-файла.'
+        )
+
+    def handle(self, *args, **options):
+        for name in ('workers', 'threads', 'iterations'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должен быть положительным')
+        alias = options['database']
+        task = (alias, options['threads'], options['iterations'])
+
+        started = time.perf_counter()
+        if options['workers'] == 1:
+            results = [acquire_connections(*task)]
+        else:
+            # дочерние процессы не должны унаследовать открытые соединения
+            connections.close_all()
+            with get_context('fork').Pool(options['workers']) as pool:
+                results = pool.starmap(
+                    acquire_connections, [task] * options['workers']
+                )
+        elapsed = time.perf_counter() - started
+
+        cycles = options['workers'] * options['threads'] * options['iterations']
+        report = {
+            'pool': connections[alias].settings_dict['OPTIONS'].get('pool')
+            is not None,
+            'cycles_per_s': round(cycles / elapsed, 1),
+            'cold': summary([t for cold, _, _ in results for t in cold]),
+            'warm': summary([t for _, warm, _ in results for t in warm]),
+            'pool_stats': [stats for _, _, stats in results if stats],
+        }
+
+        baseline = {}
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+        self.report(report, baseline, options)
+        if options['save']:
+            Path(options['save']).write_text(
+                json.dumps(report, indent=2) + '\n'
+            )
+            self.stdout.write(f'Результаты сохранены: {options["save"]}')
+
+    def report(self, report, baseline, options):
+        self.stdout.write(
+            f'{options["workers"]} воркеров × {options["threads"]} потоков, '
+            f'пул: {"да" if report["pool"] else "нет"}, '
+            f'циклов/с: {report["cycles_per_s"]}'
+        )
+        for name in ('cold', 'warm'):
+            result = report[name]
+            if result is None:
+                continue
+            line = (
+                f'{name:<5} p50 {result["p50_ms"]} мс, '
+                f'p95 {result["p95_ms"]} мс, max {result["max_ms"]} мс'
+            )
+            before = baseline.get(name)
+            if before and before['p95_ms']:
+                line += f'  (p95 ×{result["p95_ms"] / before["p95_ms"]:.2f})'
+            self.stdout.write(line)
+        for stats in report['pool_stats']:
+            self.stdout.write(
+                'пул воркера: ' + ', '.join(
+                    f'{key}={value}' for key, value in sorted(stats.items())
+                )
+            )
@@ -0,0 +1,91 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# (сессии, сообщения) — ключи SESSION_ENGINES и MESSAGE_STORAGES
+MODES = [
+    ('db', 'fallback'),
+    ('cached_db', 'cookie'),
+    ('signed_cookies', 'cookie'),
+]
+SESSION_TABLE = 'django_session'
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает запросы к базе (и отдельно к таблице сессий) на типичном '
+        'сценарии — просмотр списка, создание статуса, редирект с '
+        'сообщением — для каждого хранилища сессий и сообщений. '
+        'Данные сценария откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--views', type=int, default=5,
+            help='Сколько раз открыть список перед созданием.'
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError('Нет пользователей: запустите seed_data')
+
+        results = {}
+        for sessions, messages in MODES:
+            with override_settings(
+                SESSION_ENGINE=settings.SESSION_ENGINES[sessions],
+                MESSAGE_STORAGE=settings.MESSAGE_STORAGES[messages],
+            ):
+                results[f'{sessions}+{messages}'] = self.run_scenario(
+                    user, options['views']
+                )
+        self.report(results)
+
+    def run_scenario(self, user, views):
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        steps = [('GET список', 'get', reverse('statuses_index'), None)]
+        steps *= views
+        steps += [
+            ('POST создание', 'post', reverse('status_create'),
+             {'name': f'Статус {uuid.uuid4().hex[:8]}'}),
+            ('GET после редиректа', 'get', reverse('statuses_index'), None),
+        ]
+        total = session = 0
+        with transaction.atomic():
+            client.force_login(user)
+            for _, method, url, data in steps:
+                with CaptureQueriesContext(connection) as ctx:
+                    getattr(client, method)(url, data)
+                queries = [query['sql'] for query in ctx.captured_queries]
+                total += len(queries)
+                session += sum(SESSION_TABLE in sql for sql in queries)
+            transaction.set_rollback(True)
+        return {
+            'requests': len(steps),
+            'queries': total,
+            'session_queries': session,
+        }
+
+    def report(self, results):
+        self.stdout.write(
+            f'{"хранилище":<24} {"запросов":>8} {"к сессиям":>10} '
+            f'{"на запрос":>10}'
+        )
+        base = None
+        for mode, result in results.items():
+            per_request = result['queries'] / result['requests']
+            line = (
+                f'{mode:<24} {result["queries"]:>8} '
+                f'{result["session_queries"]:>10} {per_request:>10.2f}'
+            )
+            if base is None:
+                base = per_request
+            else:
+                line += f'  −{base - per_request:.2f} на запрос'
+            self.stdout.write(line)
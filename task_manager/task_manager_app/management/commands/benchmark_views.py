@@ -0,0 +1,154 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.task_manager_app import urls
+from task_manager.task_manager_app.models import Label, Status, Task
+
+# Вход и выход меняют сессию клиента, их не измеряем
+SKIPPED = {'logout', 'login'}
+BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'views_baseline.json'
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет каждый GET-адрес из task_manager_app/urls.py: число '
+        'SQL-запросов и задержку p50/p95, сравнивает с базовой линией.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--baseline', default=str(BASELINE),
+            help='JSON-файл с базовыми замерами.'
+        )
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Записать текущие замеры как базовую линию.'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Допустимый рост p95 относительно базовой линии.'
+        )
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Завершиться с ошибкой при регрессии.'
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть положительным')
+        task = Task.objects.order_by('pk').first()
+        user = task.author if task else User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError('Нет данных: запустите seed_data')
+
+        objects = {
+            'user': user,
+            'status': Status.objects.order_by('pk').first(),
+            'task': task,
+            'label': Label.objects.order_by('pk').first(),
+        }
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        client.force_login(user)
+
+        results = {}
+        for pattern in urls.urlpatterns:
+            if pattern.name in SKIPPED:
+                continue
+            # представления только для POST (tasks_bulk) не измеряем
+            if 'get' not in pattern.callback.view_class.http_method_names:
+                continue
+            url = self.build_url(pattern, objects)
+            if url is None:
+                self.stderr.write(f'Пропущен {pattern.name}: нет объекта')
+                continue
+            results[pattern.name] = self.measure(
+                client, url, options['repeat']
+            )
+
+        baseline_path = Path(options['baseline'])
+        baseline = {}
+        if baseline_path.exists():
+            baseline = json.loads(baseline_path.read_text())
+        regressions = self.report(results, baseline, options['tolerance'])
+
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2) + '\n')
+            self.stdout.write(f'Базовая линия сохранена: {baseline_path}')
+        if regressions and options['strict']:
+            raise CommandError(f'Регрессий: {regressions}')
+
+    def build_url(self, pattern, objects):
+        if '<int:pk>' not in str(pattern.pattern):
+            return reverse(pattern.name)
+        # api_task_detail → task, status_update → status и т. п.
+        model_name = pattern.name.removeprefix('api_').split('_')[0]
+        obj = objects.get(model_name)
+        if obj is None:
+            return None
+        return reverse(pattern.name, args=[obj.pk])
+
+    def measure(self, client, url, repeat):
+        # первый запрос прогревает кэши и не учитывается
+        client.get(url)
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = client.get(url)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                timings.append((time.perf_counter() - started) * 1000)
+        return {
+            'url': url,
+            'status': response.status_code,
+            'queries': len(queries.captured_queries) // repeat,
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+        }
+
+    def report(self, results, baseline, tolerance):
+        regressions = 0
+        self.stdout.write(
+            f'{"url":<22} {"status":>6} {"queries":>7} '
+            f'{"p50 ms":>9} {"p95 ms":>9}  сравнение'
+        )
+        for name, result in results.items():
+            notes = []
+            before = baseline.get(name)
+            if before:
+                if result['queries'] > before['queries']:
+                    notes.append(
+                        f'запросов {before["queries"]} → {result["queries"]}'
+                    )
+                if result['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+                    notes.append(
+                        f'p95 {before["p95_ms"]} → {result["p95_ms"]} мс'
+                    )
+            line = (
+                f'{name:<22} {result["status"]:>6} {result["queries"]:>7} '
+                f'{result["p50_ms"]:>9} {result["p95_ms"]:>9}  '
+            )
+            if notes:
+                regressions += 1
+                self.stdout.write(self.style.WARNING(line + '; '.join(notes)))
+            else:
+                self.stdout.write(line + ('ok' if before else '—'))
+        return regressions
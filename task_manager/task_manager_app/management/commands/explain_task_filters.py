@@ -0,0 +1,112 @@
+from itertools import combinations
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from task_manager.task_manager_app.filters import TaskFilter
+from task_manager.task_manager_app.models import Label, Status, Task
+from task_manager.task_manager_app.views import TaskListView
+
+# Признаки плохого плана: полный проход по таблице или сортировка
+# во временной структуре вместо чтения в порядке индекса.
+PLAN_WARNINGS = {
+    'sqlite': {
+        'seq_scan': lambda line: (
+            line.startswith('SCAN ') and ' USING ' not in line
+        ),
+        'temp_sort': lambda line: 'USE TEMP B-TREE' in line,
+    },
+    'postgresql': {
+        'seq_scan': lambda line: 'Seq Scan' in line,
+        'temp_sort': lambda line: line.startswith((
+            'Sort ', 'Incremental Sort '
+        )),
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN для каждой комбинации фильтров TaskFilter '
+        'и отмечает последовательные сканирования и сортировки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default='default',
+            help='Алиас базы данных для EXPLAIN.'
+        )
+        parser.add_argument(
+            '--strict', action='store_true',
+            help='Завершиться с ошибкой, если найдены проблемы.'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        checks = PLAN_WARNINGS.get(connection.vendor)
+        if checks is None:
+            raise CommandError(
+                f'EXPLAIN не поддерживается для {connection.vendor}'
+            )
+
+        user = User.objects.using(options['database']).first()
+        values = {
+            'status': self.first_pk(Status, options['database']),
+            'executor': user.pk if user else 1,
+            'labels': self.first_pk(Label, options['database']),
+            'self_tasks': 'on',
+        }
+        request = SimpleNamespace(user=user or SimpleNamespace(
+            is_authenticated=False
+        ))
+
+        problems = 0
+        for size in range(len(values) + 1):
+            for names in combinations(values, size):
+                data = {name: values[name] for name in names}
+                queryset = TaskFilter(
+                    data,
+                    queryset=Task.objects.using(options['database']),
+                    request=request,
+                ).qs
+                queryset = queryset.order_by(
+                    *TaskListView.cursor_ordering
+                )[:TaskListView.paginate_by + 1]
+                plan = queryset.explain()
+                found = sorted({
+                    warning
+                    for line in plan.splitlines()
+                    for warning, check in checks.items()
+                    if check(self.plan_step(connection.vendor, line))
+                })
+                problems += bool(found)
+                self.report(names, plan, found)
+
+        if problems and options['strict']:
+            raise CommandError(f'Проблемных планов: {problems}')
+        self.stdout.write(f'Проблемных планов: {problems}')
+
+    def plan_step(self, vendor, line):
+        if vendor == 'sqlite':
+            # Строка SQLite: "<id> <parent> <notused> <detail>"
+            return line.split(' ', 3)[-1]
+        return line.strip().removeprefix('->').strip()
+
+    def first_pk(self, model, database):
+        pk = model.objects.using(database).values_list(
+            'pk', flat=True
+        ).first()
+        return pk or 1
+
+    def report(self, names, plan, found):
+        title = ', '.join(names) or 'без фильтров'
+        if found:
+            self.stdout.write(self.style.WARNING(
+                f'[{", ".join(found)}] {title}'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'[ok] {title}'))
+        for line in plan.splitlines():
+            self.stdout.write(f'    {line}')
@@ -0,0 +1,171 @@
+import csv
+import json
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.task_manager_app.counters import (
+    apply_deltas, count_new_tasks
+)
+from task_manager.task_manager_app.etags import touch_tasks_version
+from task_manager.task_manager_app.models import Label, Status, Task
+
+
+class RejectedRow(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Массовый импорт задач из CSV или JSONL. Статус, автор, '
+        'исполнитель и метки указываются по имени.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл .csv или .jsonl')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='Формат файла, по умолчанию по расширению.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Сколько задач записывать одной транзакцией.'
+        )
+        parser.add_argument(
+            '--author',
+            help='Логин автора для строк, где он не указан.'
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'Файл не найден: {path}')
+        file_format = options['format'] or (
+            'csv' if path.suffix.lower() == '.csv' else 'jsonl'
+        )
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным')
+
+        self.statuses = dict(Status.objects.values_list('name', 'pk'))
+        self.labels = dict(Label.objects.values_list('name', 'pk'))
+        self.users = dict(User.objects.values_list('username', 'pk'))
+        self.default_author = options['author']
+        if self.default_author and self.default_author not in self.users:
+            raise CommandError(
+                f'Пользователь не найден: {self.default_author}'
+            )
+
+        started = time.monotonic()
+        imported = rejected = 0
+        with path.open(encoding='utf-8', newline='') as stream:
+            records = self.read(stream, file_format)
+            while batch := list(islice(records, options['batch_size'])):
+                tasks, task_labels = [], []
+                for line, record in batch:
+                    try:
+                        task, label_ids = self.build(record)
+                    except RejectedRow as error:
+                        rejected += 1
+                        self.stderr.write(f'Строка {line}: {error}')
+                        continue
+                    tasks.append(task)
+                    task_labels.append(label_ids)
+                self.save(tasks, task_labels)
+                imported += len(tasks)
+        # bulk_create не отправляет сигналы
+        if imported:
+            touch_tasks_version()
+
+        elapsed = time.monotonic() - started
+        rate = imported / elapsed if elapsed else imported
+        self.stdout.write(self.style.SUCCESS(
+            f'Импортировано: {imported}, отклонено: {rejected}, '
+            f'{elapsed:.2f} с ({rate:.0f} задач/с)'
+        ))
+
+    def read(self, stream, file_format):
+        if file_format == 'csv':
+            # первая строка файла — заголовок
+            for line, row in enumerate(csv.DictReader(stream), start=2):
+                labels = row.get('labels') or ''
+                row['labels'] = [
+                    name.strip() for name in labels.split(',') if name.strip()
+                ]
+                yield line, row
+            return
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as error:
+                record = error
+            yield line, record
+
+    def build(self, record):
+        if not isinstance(record, dict):
+            raise RejectedRow(f'некорректная запись: {record}')
+        name = self.text(record, 'name', 'имя задачи').strip()
+        if not name:
+            raise RejectedRow('не указано имя задачи')
+        if len(name) > Task._meta.get_field('name').max_length:
+            raise RejectedRow('слишком длинное имя задачи')
+
+        status_id = self.lookup(self.statuses, record.get('status'), 'статус')
+        author_id = self.lookup(
+            self.users, record.get('author') or self.default_author, 'автор'
+        )
+        executor_id = None
+        if record.get('executor'):
+            executor_id = self.lookup(
+                self.users, record['executor'], 'исполнитель'
+            )
+        labels = record.get('labels') or []
+        if not isinstance(labels, list):
+            raise RejectedRow('метки должны быть списком')
+        label_ids = {
+            self.lookup(self.labels, label, 'метка') for label in labels
+        }
+
+        task = Task(
+            name=name,
+            description=self.text(record, 'description', 'описание'),
+            status_id=status_id,
+            author_id=author_id,
+            executor_id=executor_id,
+        )
+        return task, label_ids
+
+    def text(self, record, field, title):
+        value = record.get(field)
+        if value is None:
+            return ''
+        if not isinstance(value, str):
+            raise RejectedRow(f'{title} должно быть строкой')
+        return value
+
+    def lookup(self, mapping, key, title):
+        if not key:
+            raise RejectedRow(f'{title}: значение не указано')
+        try:
+            return mapping[key]
+        except (KeyError, TypeError):
+            raise RejectedRow(f'{title}: не найдено «{key}»')
+
+    def save(self, tasks, task_labels):
+        if not tasks:
+            return
+        through = Task.labels.through
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks)
+            through.objects.bulk_create([
+                through(task_id=task.pk, label_id=label_id)
+                for task, label_ids in zip(tasks, task_labels)
+                for label_id in label_ids
+            ])
+            # bulk_create не отправляет сигналы
+            apply_deltas(count_new_tasks(tasks, task_labels))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from task_manager.task_manager_app.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает таблицу счётчиков задач для главной страницы. '
+        'Нужна после изменений в обход сигналов (QuerySet.update, SQL).'
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rows = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано счётчиков: {rows} '
+            f'за {time.monotonic() - started:.2f} с'
+        ))
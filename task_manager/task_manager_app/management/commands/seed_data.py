@@ -0,0 +1,122 @@
+import random
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.task_manager_app.choices import invalidate_choices
+from task_manager.task_manager_app.counters import (
+    apply_deltas, count_new_tasks
+)
+from task_manager.task_manager_app.etags import touch_tasks_version
+from task_manager.task_manager_app.models import Label, Status, Task
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу тестовыми данными заданного объёма.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--statuses', type=int, default=10)
+        parser.add_argument('--labels', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument(
+            '--labels-per-task', type=int, default=2,
+            help='Сколько меток в среднем у задачи.'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--password', default='password',
+            help='Пароль всех созданных пользователей.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Зерно генератора для воспроизводимых данных.'
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'statuses', 'labels', 'tasks'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть отрицательным')
+        if options['tasks'] and not (options['users'] or User.objects.exists()):
+            raise CommandError('Для задач нужен хотя бы один пользователь')
+        if options['tasks'] and not (
+            options['statuses'] or Status.objects.exists()
+        ):
+            raise CommandError('Для задач нужен хотя бы один статус')
+
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        # Суффикс отделяет данные повторных запусков друг от друга
+        run = uuid.uuid4().hex[:8]
+        started = time.monotonic()
+
+        with transaction.atomic():
+            password = make_password(options['password'])
+            User.objects.bulk_create([
+                User(
+                    username=f'seed_{run}_{i}',
+                    first_name=f'Имя{i}',
+                    last_name=f'Фамилия{i}',
+                    password=password,
+                )
+                for i in range(options['users'])
+            ], batch_size=batch_size)
+            Status.objects.bulk_create([
+                Status(name=f'Статус {run}-{i}')
+                for i in range(options['statuses'])
+            ], batch_size=batch_size)
+            Label.objects.bulk_create([
+                Label(name=f'Метка {run}-{i}')
+                for i in range(options['labels'])
+            ], batch_size=batch_size)
+
+        user_ids = list(User.objects.values_list('pk', flat=True))
+        executor_ids = user_ids + [None]
+        status_ids = list(Status.objects.values_list('pk', flat=True))
+        label_ids = list(Label.objects.values_list('pk', flat=True))
+        # от 0 до удвоенного среднего, чтобы среднее совпало с заданным
+        max_labels = min(options['labels_per_task'] * 2, len(label_ids))
+
+        through = Task.labels.through
+        remaining = options['tasks']
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            remaining -= size
+            with transaction.atomic():
+                tasks = Task.objects.bulk_create([
+                    Task(
+                        name=f'Задача {rng.randrange(10 ** 6)}',
+                        description=f'Описание {rng.randrange(10 ** 6)}',
+                        status_id=rng.choice(status_ids),
+                        author_id=rng.choice(user_ids),
+                        executor_id=rng.choice(executor_ids),
+                    )
+                    for _ in range(size)
+                ])
+                task_labels = [
+                    rng.sample(label_ids, rng.randint(0, max_labels))
+                    for _ in tasks
+                ]
+                through.objects.bulk_create([
+                    through(task_id=task.pk, label_id=label_id)
+                    for task, labels in zip(tasks, task_labels)
+                    for label_id in labels
+                ], batch_size=batch_size)
+                # счётчики меняются в той же транзакции, что и задачи
+                apply_deltas(count_new_tasks(tasks, task_labels))
+
+        # bulk_create не отправляет сигналы
+        for model in (User, Status, Label):
+            invalidate_choices(model)
+        touch_tasks_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {options["users"]}, '
+            f'статусов {options["statuses"]}, меток {options["labels"]}, '
+            f'задач {options["tasks"]} '
+            f'за {time.monotonic() - started:.2f} с'
+        ))
@@ -0,0 +1,166 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MARKER = 'startup_profile:'
+
+# Этапы запуска воркера в том порядке, в котором их проходит wsgi.py
+PHASES = [
+    ('django', 'import django'),
+    ('settings', 'settings.py'),
+    ('setup', 'django.setup()'),
+    ('templates', 'движок шаблонов'),
+    ('urls', 'ROOT_URLCONF'),
+    ('wsgi', 'WSGI-приложение'),
+]
+
+SCRIPT = f'''
+import sys, time
+def mark(name):
+    print('{MARKER}', name, time.perf_counter(), file=sys.stderr, flush=True)
+mark('start')
+import django
+mark('django')
+from django.conf import settings
+settings.INSTALLED_APPS
+mark('settings')
+django.setup()
+mark('setup')
+from django.template import engines
+engines.all()
+mark('templates')
+from django.urls import get_resolver
+get_resolver().url_patterns
+mark('urls')
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+mark('wsgi')
+'''
+
+
+def parse_importtime(stderr):
+    """
+    Разбирает вывод python -X importtime с отметками этапов:
+    время этапов (мс), собственное время импорта по пакетам верхнего
+    уровня (мс) и импорты, сделанные непосредственно на каждом этапе.
+    """
+    phases, packages, direct = {}, defaultdict(float), []
+    started, pending = None, []
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            # импорты печатаются по завершении, до отметки своего этапа
+            _, name, moment = line.split()
+            moment = float(moment)
+            if started is not None:
+                phases[name] = (moment - started) * 1000
+            direct += [(name, module, elapsed) for module, elapsed in pending]
+            started, pending = moment, []
+            continue
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        own, cumulative, module = line[len('import time:'):].split('|')
+        packages[module.strip().split('.')[0]] += int(own) / 1000
+        # без отступа — импорт, вызванный самим этапом, а не другим модулем
+        if not module.startswith('  ', 1):
+            pending.append((module.strip(), int(cumulative) / 1000))
+    return phases, dict(packages), direct
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает отдельный интерпретатор с python -X importtime и '
+        'раскладывает время запуска воркера по этапам (settings.py, '
+        'django.setup(), шаблоны, URL, WSGI) и по пакетам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько запусков сделать; выводятся медианы.'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=15,
+            help='Сколько пакетов и импортов показать.'
+        )
+        parser.add_argument(
+            '--save', help='Сохранить результаты в JSON-файл.'
+        )
+        parser.add_argument(
+            '--compare', help='Сравнить с результатами из JSON-файла.'
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть положительным')
+        runs = [self.run_child() for _ in range(options['repeat'])]
+        report = {
+            'phases': self.median([phases for phases, _, _ in runs]),
+            'packages': self.median([packages for _, packages, _ in runs]),
+        }
+        report['total_ms'] = round(sum(report['phases'].values()), 1)
+
+        baseline = {}
+        if options['compare']:
+            baseline = json.loads(Path(options['compare']).read_text())
+        self.report(report, runs[-1][2], baseline, options['limit'])
+        if options['save']:
+            Path(options['save']).write_text(
+                json.dumps(report, indent=2) + '\n'
+            )
+            self.stdout.write(f'Результаты сохранены: {options["save"]}')
+
+    def run_child(self):
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get(
+                'DJANGO_SETTINGS_MODULE', 'task_manager.settings'
+            ),
+        }
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(
+                'Запуск завершился с ошибкой:\n' + result.stderr[-2000:]
+            )
+        return parse_importtime(result.stderr)
+
+    def median(self, results):
+        keys = {key for result in results for key in result}
+        return {
+            key: round(statistics.median(
+                result.get(key, 0) for result in results
+            ), 1)
+            for key in keys
+        }
+
+    def report(self, report, direct, baseline, limit):
+        before = baseline.get('phases', {})
+        self.stdout.write(f'{"этап":<20} {"мс":>8}')
+        for name, title in PHASES:
+            line = f'{title:<20} {report["phases"].get(name, 0):>8}'
+            if before.get(name):
+                line += f'  ×{report["phases"][name] / before[name]:.2f}'
+            self.stdout.write(line)
+        line = f'{"всего":<20} {report["total_ms"]:>8}'
+        if baseline.get('total_ms'):
+            line += f'  ×{report["total_ms"] / baseline["total_ms"]:.2f}'
+        self.stdout.write(line)
+
+        self.stdout.write(f'\n{"пакет":<20} {"мс":>8}  (собственное время импорта)')
+        packages = sorted(report['packages'].items(), key=lambda item: -item[1])
+        for package, elapsed in packages[:limit]:
+            self.stdout.write(f'{package:<20} {elapsed:>8}')
+
+        self.stdout.write(f'\n{"этап":<10} {"мс":>8}  импорт (последний запуск)')
+        slowest = sorted(direct, key=lambda item: -item[2])
+        for phase, module, elapsed in slowest[:limit]:
+            self.stdout.write(f'{phase:<10} {elapsed:>8.1f}  {module}')
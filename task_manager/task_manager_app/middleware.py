@@ -0,0 +1,151 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .routers import RoutingState, routing_state
+
+logger = logging.getLogger('task_manager.timing')
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper: считает запросы и их суммарное время"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestTiming:
+
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view = 0.0
+        self.render_started = None
+        self.render = 0.0
+
+    def end_view(self):
+        if self.view_started is not None and not self.view:
+            self.view = time.perf_counter() - self.view_started
+
+
+class RequestTimingMiddleware:
+    """
+    Считает для каждого запроса число SQL-запросов, время в базе,
+    в представлении и на рендер шаблона. Результат уходит в заголовок
+    Server-Timing и в лог task_manager.timing одной JSON-строкой.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = request.request_timing = RequestTiming()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing.queries))
+            response = self.get_response(request)
+        timing.end_view()
+        total = time.perf_counter() - timing.started
+
+        metrics = {
+            'db': timing.queries.duration,
+            'view': timing.view,
+            'tpl': timing.render,
+            'total': total,
+        }
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={value * 1000:.1f}' for name, value in metrics.items()
+        ) + f', queries;desc="{timing.queries.count}"'
+
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'url_name': match.view_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timing.queries.count,
+            **{f'{name}_ms': round(value * 1000, 1)
+               for name, value in metrics.items()},
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.request_timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.request_timing
+        timing.end_view()
+        timing.render_started = time.perf_counter()
+
+        def stop_render(rendered):
+            timing.render = time.perf_counter() - timing.render_started
+
+        response.add_post_render_callback(stop_render)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Включает PrimaryReplicaRouter для запроса. Безопасные запросы читают
+    с реплики, пока в них нет записи. После записи браузер получает
+    cookie и следующие REPLICA_PIN_SECONDS секунд читает с основной
+    базы — так после редиректа видно только что сохранённое.
+    """
+    cookie_name = 'read_primary'
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(response, state)
+
+    async def __acall__(self, request):
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.finish(response, state)
+
+    def start(self, request):
+        pinned = (
+            request.method not in ('GET', 'HEAD', 'OPTIONS')
+            or self.cookie_name in request.COOKIES
+        )
+        state = RoutingState(pinned)
+        return state, routing_state.set(state)
+
+    def finish(self, response, state):
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
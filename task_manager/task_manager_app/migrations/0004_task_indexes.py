@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager_app", "0003_label_task_labels"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_at", "id"], name="task_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "-created_at", "id"],
+                name="task_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["executor", "-created_at", "id"],
+                name="task_executor_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["author", "-created_at", "id"],
+                name="task_author_created_idx",
+            ),
+        ),
+        # Автоматическая промежуточная таблица Task.labels не поддерживает
+        # Meta.indexes, поэтому индекс для фильтра по метке создаётся SQL.
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX task_labels_label_task_idx "
+                "ON task_manager_app_task_labels (label_id, task_id)"
+            ),
+            reverse_sql="DROP INDEX task_labels_label_task_idx",
+        ),
+    ]
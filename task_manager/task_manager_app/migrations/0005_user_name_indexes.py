@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("task_manager_app", "0004_task_indexes"),
+    ]
+
+    # Индексы для поиска исполнителей по префиксу имени и фамилии;
+    # username уже проиндексирован уникальным ограничением.
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE INDEX auth_user_first_name_idx ON auth_user (first_name)",
+            reverse_sql="DROP INDEX auth_user_first_name_idx",
+        ),
+        migrations.RunSQL(
+            sql="CREATE INDEX auth_user_last_name_idx ON auth_user (last_name)",
+            reverse_sql="DROP INDEX auth_user_last_name_idx",
+        ),
+    ]
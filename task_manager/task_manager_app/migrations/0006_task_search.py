@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:20
+
+from django.db import migrations
+
+# Индекс обновляется самой базой: в SQLite триггерами внешней
+# FTS5-таблицы, в PostgreSQL генерируемой колонкой tsvector.
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE task_manager_app_task_fts USING fts5(
+        name, description,
+        content='task_manager_app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER task_fts_insert AFTER INSERT ON task_manager_app_task
+    BEGIN
+        INSERT INTO task_manager_app_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER task_fts_delete AFTER DELETE ON task_manager_app_task
+    BEGIN
+        INSERT INTO task_manager_app_task_fts
+            (task_manager_app_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER task_fts_update AFTER UPDATE OF name, description
+    ON task_manager_app_task
+    BEGIN
+        INSERT INTO task_manager_app_task_fts
+            (task_manager_app_task_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO task_manager_app_task_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    INSERT INTO task_manager_app_task_fts (task_manager_app_task_fts)
+    VALUES ('rebuild')
+    """,
+]
+SQLITE_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS task_fts_insert",
+    "DROP TRIGGER IF EXISTS task_fts_delete",
+    "DROP TRIGGER IF EXISTS task_fts_update",
+    "DROP TABLE IF EXISTS task_manager_app_task_fts",
+]
+
+POSTGRES_SETUP = [
+    """
+    ALTER TABLE task_manager_app_task ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', name), 'A') ||
+        setweight(to_tsvector('russian', description), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX task_search_vector_idx ON task_manager_app_task
+    USING gin (search_vector)
+    """,
+]
+POSTGRES_TEARDOWN = [
+    "DROP INDEX IF EXISTS task_search_vector_idx",
+    "ALTER TABLE task_manager_app_task DROP COLUMN IF EXISTS search_vector",
+]
+
+STATEMENTS = {
+    "sqlite": (SQLITE_SETUP, SQLITE_TEARDOWN),
+    "postgresql": (POSTGRES_SETUP, POSTGRES_TEARDOWN),
+}
+
+
+def create_search_index(apps, schema_editor):
+    setup, _ = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for sql in setup:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    _, teardown = STATEMENTS.get(schema_editor.connection.vendor, ([], []))
+    for sql in teardown:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager_app", "0005_user_name_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:56
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    Task = apps.get_model("task_manager_app", "Task")
+    TaskCounter = apps.get_model("task_manager_app", "TaskCounter")
+    rows = []
+    for kind, field in (("status", "status"), ("executor", "executor")):
+        grouped = (
+            Task.objects.filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(total=Count("pk"))
+            .order_by()
+        )
+        rows += [
+            TaskCounter(kind=kind, object_id=row[field], count=row["total"])
+            for row in grouped
+        ]
+    grouped = (
+        Task.labels.through.objects.values("label")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    rows += [
+        TaskCounter(kind="label", object_id=row["label"], count=row["total"])
+        for row in grouped
+    ]
+    TaskCounter.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager_app", "0006_task_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("status", "Status"),
+                            ("executor", "Executor"),
+                            ("label", "Label"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "object_id"),
+                        name="task_counter_kind_object_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:10
+
+from importlib import import_module
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+# В SQLite AddField с значением по умолчанию пересоздаёт таблицу задач,
+# и триггеры полнотекстового индекса из 0006 пропадают вместе с ней.
+search = import_module("task_manager.task_manager_app.migrations.0006_task_search")
+SQLITE_TRIGGERS = [sql for sql in search.SQLITE_SETUP if "CREATE TRIGGER" in sql]
+SQLITE_REBUILD = [sql for sql in search.SQLITE_SETUP if "'rebuild'" in sql]
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in search.SQLITE_TEARDOWN:
+        if "TRIGGER" in sql:
+            schema_editor.execute(sql)
+    for sql in SQLITE_TRIGGERS + SQLITE_REBUILD:
+        schema_editor.execute(sql)
+
+
+def fill_updated_at(apps, schema_editor):
+    Task = apps.get_model("task_manager_app", "Task")
+    Task.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager_app", "0007_task_counter"),
+    ]
+
+    operations = [
+        # при откате RemoveField тоже пересоздаёт таблицу
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name="Updated at",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["updated_at", "id"], name="task_updated_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at", "task_id"],
+                        name="task_tombstone_deleted_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:59
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Поиск исполнителей по префиксу без учёта регистра: индексы по
+# LOWER() логина, имени и фамилии (choices.prefix_q). Индексы 0005
+# по самим колонкам больше ни один запрос не использует.
+USER_FIELDS = ["username", "first_name", "last_name"]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("task_manager_app", "0008_task_updated_at_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="label",
+            index=models.Index(
+                django.db.models.functions.text.Lower("name"),
+                name="label_name_lower_idx",
+            ),
+        ),
+        *[
+            migrations.RunSQL(
+                sql=(
+                    f"CREATE INDEX auth_user_{field}_lower_idx "
+                    f"ON auth_user (LOWER({field}))"
+                ),
+                reverse_sql=f"DROP INDEX auth_user_{field}_lower_idx",
+            )
+            for field in USER_FIELDS
+        ],
+        *[
+            migrations.RunSQL(
+                sql=f"DROP INDEX auth_user_{field}_idx",
+                reverse_sql=(
+                    f"CREATE INDEX auth_user_{field}_idx ON auth_user ({field})"
+                ),
+            )
+            for field in ["first_name", "last_name"]
+        ],
+    ]
@@ -1,8 +1,40 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models.functions import Coalesce, Lower
 from django.utils.translation import gettext_lazy as _
 
 
+def count_tasks(field):
+    """Подзапрос с числом задач, у которых field ссылается на объект"""
+    tasks = Task.objects.filter(**{field: models.OuterRef('pk')})
+    return Coalesce(models.Subquery(
+        tasks.order_by().values(field).annotate(
+            count=models.Count('pk')
+        ).values('count')
+    ), 0)
+
+
+def users_with_usage(queryset=None):
+    """
+    Пользователи с числом задач, где они автор (authored_count)
+    и исполнитель (assigned_count). Два счётчика по разным связям
+    считаются подзапросами, чтобы JOIN не перемножал строки.
+    """
+    if queryset is None:
+        queryset = User.objects.all()
+    return queryset.annotate(
+        authored_count=count_tasks('author'),
+        assigned_count=count_tasks('executor'),
+    )
+
+
+class StatusQuerySet(models.QuerySet):
+
+    def with_usage(self):
+        """Добавляет task_count — число задач с этим статусом"""
+        return self.annotate(task_count=models.Count('task'))
+
+
 class Status(models.Model):
     name = models.CharField(
         max_length=150,
@@ -14,6 +46,8 @@ class Status(models.Model):
         verbose_name=_('Created at')
     )
 
+    objects = StatusQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('Status')
         verbose_name_plural = _('Statuses')
@@ -23,6 +57,15 @@ class Status(models.Model):
         return self.name
 
 
+class TaskQuerySet(models.QuerySet):
+
+    def with_relations(self):
+        """Загружает всё, что выводится вместе с задачей"""
+        return self.select_related(
+            'status', 'author', 'executor'
+        ).prefetch_related('labels')
+
+
 class Task(models.Model):
     name = models.CharField(
         max_length=150,
@@ -61,15 +104,57 @@ class Task(models.Model):
         auto_now_add=True,
         verbose_name=_('Created at')
     )
+    # Меняется при каждом изменении задачи, включая метки (signals.py).
+    # QuerySet.update не трогает auto_now — такой код задаёт его сам.
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Updated at')
+    )
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         verbose_name = _('Task')
         verbose_name_plural = _('Tasks')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at', 'id'],
+                name='task_created_idx'
+            ),
+            models.Index(
+                fields=['status', '-created_at', 'id'],
+                name='task_status_created_idx'
+            ),
+            models.Index(
+                fields=['executor', '-created_at', 'id'],
+                name='task_executor_created_idx'
+            ),
+            models.Index(
+                fields=['author', '-created_at', 'id'],
+                name='task_author_created_idx'
+            ),
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='task_updated_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # сигналы save обновляют TaskCounter в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class LabelQuerySet(models.QuerySet):
+
+    def with_usage(self):
+        """Добавляет task_count — число задач с этой меткой"""
+        return self.annotate(task_count=models.Count('tasks'))
+
 
 class Label(models.Model):
     name = models.CharField(
@@ -79,5 +164,63 @@ class Label(models.Model):
         auto_now_add=True, verbose_name=_("Created at")
     )
 
+    objects = LabelQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # поиск в автодополнении без учёта регистра (choices.prefix_q)
+            models.Index(Lower('name'), name='label_name_lower_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class TaskCounter(models.Model):
+    """
+    Число задач по статусу, исполнителю или метке. Обновляется
+    сигналами из counters.py, пересчитывается rebuild_task_counters.
+    """
+    STATUS = 'status'
+    EXECUTOR = 'executor'
+    LABEL = 'label'
+    KINDS = [
+        (STATUS, _('Status')),
+        (EXECUTOR, _('Executor')),
+        (LABEL, _('Label')),
+    ]
+
+    kind = models.CharField(max_length=16, choices=KINDS)
+    object_id = models.BigIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='task_counter_kind_object_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}:{self.object_id} = {self.count}'
+
+
+class TaskTombstone(models.Model):
+    """
+    Запись об удалённой задаче: по ней лента изменений (sync.py)
+    сообщает клиентам об удалении.
+    """
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['deleted_at', 'task_id'],
+                name='task_tombstone_deleted_idx'
+            ),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f'{self.task_id} @ {self.deleted_at:%Y-%m-%d %H:%M:%S}'
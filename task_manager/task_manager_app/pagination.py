@@ -0,0 +1,147 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+
+class CursorPage:
+    """Страница keyset-пагинации с непрозрачными курсорами"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], 'next')
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], 'prev')
+
+
+class CursorPaginator:
+    """
+    Keyset-пагинация: каждая страница выбирается условием
+    по ключу сортировки, а не через OFFSET, поэтому глубокие
+    страницы стоят столько же, сколько первая.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.names = [field.lstrip('-') for field in self.ordering]
+        # Для аннотаций (например, search_rank) поля модели нет,
+        # их значения хранятся в курсоре как есть.
+        self.fields = [
+            None if name in queryset.query.annotations
+            else queryset.model._meta.get_field(name)
+            for name in self.names
+        ]
+
+    def encode_cursor(self, obj, direction):
+        values = [
+            getattr(obj, name) if field is None
+            else field.value_to_string(obj)
+            for name, field in zip(self.names, self.fields)
+        ]
+        payload = json.dumps([direction, values], separators=(',', ':'))
+        return base64.urlsafe_b64encode(
+            payload.encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(padded))
+            if direction not in ('next', 'prev'):
+                raise ValueError(direction)
+            if len(values) != len(self.fields):
+                raise ValueError(values)
+            values = [
+                self._annotation_value(value) if field is None
+                else field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, binascii.Error, ValidationError):
+            raise Http404(_('Некорректный курсор страницы'))
+        return direction, values
+
+    def _annotation_value(self, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(value)
+        return value
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        )
+
+    def _seek(self, values, reverse):
+        condition = Q()
+        for index, field in enumerate(self._ordering(reverse)):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            for prev_name, value in zip(self.names[:index], values):
+                step &= Q(**{prev_name: value})
+            condition |= step
+        return condition
+
+    def _page_queryset(self, cursor):
+        reverse = False
+        queryset = self.queryset
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+            reverse = direction == 'prev'
+            queryset = queryset.filter(self._seek(values, reverse))
+        queryset = queryset.order_by(*self._ordering(reverse))
+        return queryset[:self.per_page + 1], reverse
+
+    def _make_page(self, rows, cursor, reverse):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if reverse:
+            rows.reverse()
+            return CursorPage(rows, self, True, has_more)
+        return CursorPage(rows, self, has_more, bool(cursor))
+
+    def page(self, cursor=None):
+        queryset, reverse = self._page_queryset(cursor)
+        return self._make_page(list(queryset), cursor, reverse)
+
+    async def apage(self, cursor=None):
+        """То же, что page(), через асинхронный ORM"""
+        queryset, reverse = self._page_queryset(cursor)
+        rows = [row async for row in queryset]
+        return self._make_page(rows, cursor, reverse)
@@ -0,0 +1,57 @@
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+
+# Состояние маршрутизации текущего запроса (ReplicaRoutingMiddleware).
+# Вне запросов — в командах, миграциях, shell — его нет, и чтение
+# идёт с основной базы.
+routing_state = ContextVar('routing_state', default=None)
+
+
+def reads_from_replica():
+    """Читает ли текущий запрос с реплики (см. db_for_read)"""
+    state = routing_state.get()
+    return state is not None and not state.pinned
+
+
+class RoutingState:
+
+    def __init__(self, pinned):
+        # читать с основной базы до конца запроса
+        self.pinned = pinned
+        # в запросе была запись
+        self.wrote = False
+
+
+class PrimaryReplicaRouter:
+    """
+    Чтение в безопасных запросах уходит на реплику, запись — на основную
+    базу. После первой записи запрос до конца читает с основной базы,
+    чтобы видеть свои изменения; сессии и чтение внутри транзакции
+    тоже всегда идут на основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if state is None or state.pinned:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label == 'sessions':
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # реплика содержит те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
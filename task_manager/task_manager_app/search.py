@@ -0,0 +1,53 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'task_manager_app_task_fts'
+SEARCH_CONFIG = 'russian'
+
+
+def fts_query(text):
+    """Запрос FTS5 из пользовательского ввода: слова как префиксы"""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_tasks(queryset, text):
+    """
+    Отбирает задачи по полнотекстовому индексу и добавляет
+    аннотацию search_rank: чем больше, тем релевантнее.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        query = fts_query(text)
+        if not query:
+            return queryset
+        matches = RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [query]
+        )
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = task_manager_app_task.id',
+            [query], output_field=FloatField()
+        )
+    elif vendor == 'postgresql':
+        matches = RawSQL(
+            'SELECT id FROM task_manager_app_task WHERE search_vector @@ '
+            f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)",
+            [text]
+        )
+        rank = RawSQL(
+            'ts_rank(task_manager_app_task.search_vector, '
+            f"websearch_to_tsquery('{SEARCH_CONFIG}', %s))",
+            [text], output_field=FloatField()
+        )
+    else:
+        # Для остальных баз полнотекстового индекса нет
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text)
+        )
+    return queryset.filter(id__in=matches).annotate(search_rank=rank)
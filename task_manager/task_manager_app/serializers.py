@@ -0,0 +1,21 @@
+from .choices import user_label
+
+TASK_FIELDS = (
+    'id', 'name', 'description', 'status', 'author',
+    'executor', 'labels', 'created_at', 'updated_at',
+)
+
+
+def serialize_task(task):
+    """Словарь с данными задачи; связи должны быть загружены заранее"""
+    return {
+        'id': task.pk,
+        'name': task.name,
+        'description': task.description,
+        'status': task.status.name,
+        'author': user_label(task.author),
+        'executor': user_label(task.executor) if task.executor else None,
+        'labels': [label.name for label in task.labels.all()],
+        'created_at': task.created_at.isoformat(),
+        'updated_at': task.updated_at.isoformat(),
+    }
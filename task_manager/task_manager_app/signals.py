@@ -0,0 +1,177 @@
+from django.contrib.auth.models import User
+from collections import Counter
+
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import counters, events
+from .backends import forget_user
+from .choices import invalidate_choices
+from .etags import touch_tasks_version
+from .fragments import touch_row_version
+from .models import Label, Status, Task, TaskCounter, TaskTombstone
+
+
+def is_login_update(update_fields):
+    # Вход пользователя обновляет только last_login — данные не меняются
+    return bool(update_fields) and set(update_fields) <= {'last_login'}
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_choices(sender, instance, update_fields=None, **kwargs):
+    if is_login_update(update_fields):
+        return
+    invalidate_choices(sender, instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_cached_user(sender, instance, update_fields=None, **kwargs):
+    # смена пароля, имени, is_active — всё проходит через save()
+    if is_login_update(update_fields):
+        return
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_task_rows(sender, update_fields=None, **kwargs):
+    # имя статуса и пользователей выводится в каждой строке списка задач
+    if is_login_update(update_fields):
+        return
+    touch_row_version(sender)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Status)
+@receiver(post_delete, sender=Status)
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=Label)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(m2m_changed, sender=Task.labels.through)
+def refresh_tasks_version(sender, update_fields=None, **kwargs):
+    if is_login_update(update_fields):
+        return
+    touch_tasks_version()
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted_keys(sender, instance, raw=False, **kwargs):
+    instance._counted_keys = []
+    if raw or instance._state.adding:
+        return
+    # Task.save() открывает транзакцию: строка заблокирована до записи
+    # счётчиков, и параллельное сохранение не вычтет те же значения
+    before = Task.objects.select_for_update().filter(
+        pk=instance.pk
+    ).values_list('status_id', 'executor_id').first()
+    if before:
+        instance._counted_keys = counters.task_keys(*before)
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = Counter(counters.task_keys(instance.status_id, instance.executor_id))
+    deltas.subtract(instance._counted_keys)
+    counters.apply_deltas(deltas)
+
+
+@receiver(pre_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    # связи с метками удаляются без m2m_changed, поэтому учитываем их здесь
+    label_ids = instance.labels.values_list('pk', flat=True)
+    deltas = Counter()
+    deltas.subtract(
+        counters.task_keys(instance.status_id, instance.executor_id)
+        + counters.label_keys(label_ids)
+    )
+    counters.apply_deltas(deltas)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def count_task_labels(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'post_add':
+        # pk_set содержит только действительно добавленные связи
+        sign = 1
+    elif action in ('pre_remove', 'pre_clear'):
+        # remove() получает и несуществующие связи: считаем по таблице
+        sign = -1
+        links = sender.objects.filter(
+            **{'label_id' if reverse else 'task_id': instance.pk}
+        )
+        if pk_set is not None:
+            links = links.filter(
+                **{'task_id__in' if reverse else 'label_id__in': pk_set}
+            )
+        column = 'task_id' if reverse else 'label_id'
+        pk_set = list(links.values_list(column, flat=True))
+    else:
+        return
+    if reverse:
+        deltas = Counter({(TaskCounter.LABEL, instance.pk): len(pk_set)})
+    else:
+        deltas = Counter(counters.label_keys(pk_set))
+    counters.apply_deltas({key: sign * delta for key, delta in deltas.items()})
+
+
+@receiver(post_delete, sender=Label)
+def drop_label_counter(sender, instance, **kwargs):
+    TaskCounter.objects.filter(
+        kind=TaskCounter.LABEL, object_id=instance.pk
+    ).delete()
+
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, **kwargs):
+    TaskTombstone.objects.create(task_id=instance.pk)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def touch_relabelled_tasks(sender, instance, action, reverse, pk_set, **kwargs):
+    # смена меток — изменение задачи для ленты изменений (sync.py)
+    # и для открытых списков задач (events.py): от меток зависит фильтр
+    if not reverse:
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        if action != 'post_clear' and not pk_set:
+            return
+        task_ids = [instance.pk]
+    elif action in ('post_add', 'post_remove'):
+        task_ids = pk_set
+    elif action == 'pre_clear':
+        task_ids = list(instance.tasks.values_list('pk', flat=True))
+    else:
+        return
+    now = timezone.now()
+    Task.objects.filter(pk__in=task_ids).update(updated_at=now)
+    if not reverse:
+        instance.updated_at = now
+    for pk in task_ids:
+        events.publish_task_event(events.UPDATED, pk)
+
+
+@receiver(post_save, sender=Task)
+def publish_saved_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    kind = events.CREATED if created else events.UPDATED
+    events.publish_task_event(kind, instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+def publish_deleted_task(sender, instance, **kwargs):
+    events.publish_task_event(events.DELETED, instance.pk)
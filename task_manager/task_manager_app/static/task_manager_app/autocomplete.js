@@ -0,0 +1,63 @@
+// Автодополнение для select[data-autocomplete-url]: сервер рисует только
+// выбранные варианты, остальные подгружаются по мере ввода.
+(function () {
+    'use strict';
+
+    var DELAY = 250;
+
+    function setup(select) {
+        var search = document.createElement('input');
+        search.type = 'search';
+        search.className = 'form-control mb-1';
+        search.placeholder = 'Поиск…';
+        search.autocomplete = 'off';
+        select.parentNode.insertBefore(search, select);
+
+        var timer = null;
+        var controller = null;
+
+        function render(results) {
+            var keep = {};
+            Array.prototype.forEach.call(select.options, function (option) {
+                if (option.selected || option.value === '') {
+                    keep[option.value] = true;
+                } else {
+                    option.remove();
+                }
+            });
+            results.forEach(function (item) {
+                var value = String(item.id);
+                if (!keep[value]) {
+                    select.add(new Option(item.text, value));
+                }
+            });
+        }
+
+        function load() {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            var url = new URL(select.dataset.autocompleteUrl, window.location.href);
+            url.searchParams.set('q', search.value.trim());
+            fetch(url, {
+                credentials: 'same-origin',
+                headers: {'Accept': 'application/json'},
+                signal: controller.signal
+            })
+                .then(function (response) { return response.json(); })
+                .then(function (data) { render(data.results); })
+                .catch(function () {});
+        }
+
+        search.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(load, DELAY);
+        });
+        search.addEventListener('focus', load, {once: true});
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('select[data-autocomplete-url]').forEach(setup);
+    });
+})();
@@ -0,0 +1,16 @@
+// Флажок в заголовке таблицы отмечает все задачи страницы
+// для формы массового изменения.
+(function () {
+    'use strict';
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('[data-select-rows]').forEach(function (toggle) {
+            var table = toggle.closest('table');
+            toggle.addEventListener('change', function () {
+                table.querySelectorAll('tbody input[name="bulk-tasks"]').forEach(function (box) {
+                    box.checked = toggle.checked;
+                });
+            });
+        });
+    });
+}());
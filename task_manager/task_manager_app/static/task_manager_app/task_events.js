@@ -0,0 +1,52 @@
+// Живое обновление списка задач: сервер присылает по SSE готовые строки
+// таблицы (upsert) и id строк, которые нужно убрать (remove).
+(function () {
+    'use strict';
+
+    function setup(body) {
+        if (!window.EventSource) {
+            return;
+        }
+        var source = new EventSource(body.dataset.eventsUrl);
+
+        function findRow(id) {
+            return body.querySelector('tr[data-task-id="' + id + '"]');
+        }
+
+        function parseRow(html) {
+            var template = document.createElement('template');
+            template.innerHTML = html.trim();
+            return template.content.firstElementChild;
+        }
+
+        source.addEventListener('upsert', function (event) {
+            var data = JSON.parse(event.data);
+            var row = findRow(data.id);
+            if (row) {
+                row.replaceWith(parseRow(data.html));
+            } else if (data.created && 'insertNew' in body.dataset) {
+                var empty = body.querySelector('tr[data-empty]');
+                if (empty) {
+                    empty.remove();
+                }
+                body.prepend(parseRow(data.html));
+            }
+        });
+
+        source.addEventListener('remove', function (event) {
+            var row = findRow(JSON.parse(event.data).id);
+            if (row) {
+                row.remove();
+            }
+        });
+
+        source.addEventListener('reload', function () {
+            source.close();
+            window.location.reload();
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('tbody[data-events-url]').forEach(setup);
+    });
+}());
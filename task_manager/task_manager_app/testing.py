@@ -0,0 +1,59 @@
+import re
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Литералы заменяются на ?, списки IN (?, ?, ...) сворачиваются,
+# чтобы запросы, отличающиеся только параметрами, совпали по форме.
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+IN_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+def sql_shape(sql):
+    shape = LITERALS.sub('?', sql)
+    shape = IN_LISTS.sub('(?)', shape)
+    return ' '.join(shape.split())
+
+
+class QueryBudgetMixin:
+    """
+    Проверки для TestCase: запрос к адресу укладывается в бюджет
+    запросов представления и не повторяет одну и ту же форму SQL
+    (признак N+1).
+    """
+
+    # сколько раз одна форма SQL может встретиться в ответе: профиль
+    # пользователя из request.user и get_object совпадают по форме
+    max_repeated_shape = 2
+
+    def capture_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response, [query['sql'] for query in ctx.captured_queries]
+
+    def assertNoRepeatedQueries(self, queries, url=''):
+        repeated = {
+            shape: count
+            for shape, count in Counter(map(sql_shape, queries)).items()
+            if count > self.max_repeated_shape
+        }
+        if repeated:
+            details = '\n'.join(
+                f'  {count}× {shape}' for shape, count in repeated.items()
+            )
+            self.fail(f'Повторяющиеся запросы (N+1) в {url}:\n{details}')
+
+    def assertWithinQueryBudget(self, url, budget, **params):
+        response, queries = self.capture_queries(url, **params)
+        self.assertLess(response.status_code, 400, url)
+        self.assertNoRepeatedQueries(queries, url)
+        if len(queries) > budget:
+            listing = '\n'.join(f'  {sql}' for sql in queries)
+            self.fail(
+                f'{url}: {len(queries)} запросов при бюджете {budget}:\n'
+                f'{listing}'
+            )
+        return response
@@ -1,13 +1,18 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 urlpatterns = [
     path('', views.IndexView.as_view(), name='index'),
+    path('health/', views.HealthView.as_view(), name='health'),
     
     # Пользователи
     path('users/', views.UserListView.as_view(), 
          name='users_index'
     ),
+    path('users/autocomplete/', views.UserAutocompleteView.as_view(), 
+         name='users_autocomplete'
+    ),
     path('users/create/', views.UserCreateView.as_view(), 
          name='user_create'
     ),
@@ -38,6 +43,15 @@ urlpatterns = [
     
     # Задачи
     path('tasks/', views.TaskListView.as_view(), name='tasks_index'),
+    path('tasks/events/', views.TaskEventsView.as_view(), 
+         name='task_events'
+    ),
+    path('tasks/bulk/', views.TaskBulkView.as_view(), 
+         name='tasks_bulk'
+    ),
+    path('tasks/export/', views.TaskExportView.as_view(), 
+         name='tasks_export'
+    ),
     path('tasks/create/', views.TaskCreateView.as_view(), 
          name='task_create'
     ),
@@ -45,6 +59,15 @@ urlpatterns = [
          name='task_detail'
         
         ),
+    path('api/tasks/', views.TaskApiListView.as_view(), 
+         name='api_tasks'
+    ),
+    path('api/tasks/changes/', views.TaskChangesView.as_view(), 
+         name='api_task_changes'
+    ),
+    path('api/tasks/<int:pk>/', views.TaskApiDetailView.as_view(), 
+         name='api_task_detail'
+    ),
     path('tasks/<int:pk>/update/', views.TaskUpdateView.as_view(), 
          name='task_update'
     ),
@@ -54,6 +77,9 @@ urlpatterns = [
     
     # Метки
     path('labels/', views.LabelListView.as_view(), name='labels_index'),
+    path('labels/autocomplete/', views.LabelAutocompleteView.as_view(), 
+         name='labels_autocomplete'
+    ),
     path('labels/create/', views.LabelCreateView.as_view(), 
          name='label_create'
     ),
@@ -63,4 +89,27 @@ urlpatterns = [
     path('labels/<int:pk>/delete/', views.LabelDeleteView.as_view(), 
          name='label_delete'
     ),
-]
\ No newline at end of file
+]
+
+# Под ASGI страницы чтения обслуживают async-версии представлений
+ASYNC_VIEWS = {
+    'users_index': views.AsyncUserListView,
+    'statuses_index': views.AsyncStatusListView,
+    'tasks_index': views.AsyncTaskListView,
+    'task_detail': views.AsyncTaskDetailView,
+    'labels_index': views.AsyncLabelListView,
+}
+
+
+def use_async_views(patterns):
+    return [
+        path(
+            str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(),
+            name=pattern.name
+        ) if pattern.name in ASYNC_VIEWS else pattern
+        for pattern in patterns
+    ]
+
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = use_async_views(urlpatterns)
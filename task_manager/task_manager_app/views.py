@@ -1,40 +1,120 @@
 # task_manager_app/views.py
+import asyncio
+import csv
+import inspect
+import json
+
 from django.views.generic import (
-    TemplateView, ListView, CreateView,
+    View, TemplateView, ListView, CreateView,
     UpdateView, DeleteView, DetailView
 )
+from django.conf import settings
+from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.auth.models import User
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
-from django.urls import reverse_lazy
-from django.shortcuts import redirect
+from django.urls import reverse, reverse_lazy
+from django.shortcuts import redirect, get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+)
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.utils.translation import gettext_lazy as _
-from django.db.models import ProtectedError
+from django.db import connections
+from django.db.models import ProtectedError, Q
 from django_filters.views import FilterView
+from asgiref.sync import sync_to_async
+from .choices import prefix_q, user_label
+from .counters import task_dashboard
+from .etags import tasks_etag, tasks_last_modified
+from .events import CREATED, DELETED, coalesce, get_broker
 from .filters import TaskFilter
+from .fragments import get_row_version
+from .health import check_databases
 from .forms import (
     UserRegistrationForm, UserUpdateForm,
-    StatusForm, TaskForm, LabelForm, UserLoginForm
+    StatusForm, TaskForm, TaskBulkForm, LabelForm, UserLoginForm
 )
-from .models import Status, Task, Label
+from .models import Status, Task, Label, users_with_usage
+from .pagination import CursorPaginator
+from .routers import reads_from_replica
+from .serializers import TASK_FIELDS, serialize_task
+from .sync import InvalidToken, changes_since
+
+
+class InUseDeleteMixin:
+    """
+    Удаление объекта, на который не ссылаются задачи. Объект загружается
+    один раз вместе со счётчиками использования из get_queryset,
+    поэтому проверка не требует отдельных запросов.
+    """
+    in_use_message = None
+
+    def get_object(self, queryset=None):
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
+    def is_in_use(self, obj):
+        return obj.task_count > 0
+
+    def post(self, request, *args, **kwargs):
+        if self.is_in_use(self.get_object()):
+            messages.error(request, self.in_use_message)
+            return redirect(self.success_url)
+        try:
+            messages.success(request, self.success_message)
+            return super().post(request, *args, **kwargs)
+        except ProtectedError:
+            # задачу могли создать между проверкой и удалением
+            messages.error(request, self.in_use_message)
+            return redirect(self.success_url)
 
 
 class IndexView(TemplateView):
     template_name = 'index.html'
+    query_budget = 2
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.request.user.is_authenticated:
+            context['dashboard'] = task_dashboard()
+        return context
+
+
+class HealthView(View):
+    """Доступность баз данных и метрики пула соединений для мониторинга"""
+    query_budget = 1
+
+    def get(self, request, *args, **kwargs):
+        databases = check_databases()
+        healthy = all(database['ok'] for database in databases.values())
+        return JsonResponse(
+            {'status': 'ok' if healthy else 'error', 'databases': databases},
+            status=200 if healthy else 503,
+        )
 
 
 class UserListView(ListView):
     model = User
     template_name = 'users/index.html'
+    query_budget = 2
     context_object_name = 'users'
 
+    def get_queryset(self):
+        return users_with_usage(super().get_queryset())
+
 
 class UserCreateView(SuccessMessageMixin, CreateView):
     model = User
     form_class = UserRegistrationForm
     template_name = 'users/create.html'
+    query_budget = 1
     success_url = reverse_lazy('login')
     success_message = _('Пользователь успешно зарегистрирован')
 
@@ -43,6 +123,7 @@ class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = User
     form_class = UserUpdateForm
     template_name = 'users/update.html'
+    query_budget = 2
     success_url = reverse_lazy('users_index')
     success_message = _('Пользователь успешно изменен')
 
@@ -55,12 +136,12 @@ class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
-        user = form.save()
-        password = form.cleaned_data.get('password1')
-        if password:
-            from django.contrib.auth import update_session_auth_hash
-            update_session_auth_hash(self.request, user)
-        return super().form_valid(form)
+        # форма сохраняется один раз: повторный set_password дал бы новую
+        # соль, и хэш сессии из update_session_auth_hash сразу устарел бы
+        response = super().form_valid(form)
+        if form.cleaned_data.get('password1'):
+            update_session_auth_hash(self.request, self.object)
+        return response
 
     def form_invalid(self, form):
         return super().form_invalid(form)
@@ -70,11 +151,17 @@ class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
         return context
 
 
-class UserDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class UserDeleteView(
+    LoginRequiredMixin, SuccessMessageMixin, InUseDeleteMixin, DeleteView
+):
     model = User
     template_name = 'users/delete.html'
+    query_budget = 2
     success_url = reverse_lazy('users_index')
     success_message = _('Пользователь успешно удален')
+    in_use_message = _(
+        'Невозможно удалить пользователя, который используется'
+    )
 
     def dispatch(self, request, *args, **kwargs):
         if request.user.id != kwargs.get('pk'):
@@ -84,27 +171,17 @@ class UserDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
             return redirect('users_index')
         return super().dispatch(request, *args, **kwargs)
 
-    def post(self, request, *args, **kwargs):
-        user = self.get_object()
-        try:
-            if user.authored_tasks.exists() or user.assigned_tasks.exists():
-                messages.error(request, _(
-                    'Невозможно удалить пользователя, который используется'
-                ))
-                return redirect('users_index')
+    def get_queryset(self):
+        return users_with_usage(super().get_queryset())
 
-            messages.success(request, self.success_message)
-            return super().post(request, *args, **kwargs)
-        except ProtectedError:
-            messages.error(request, _(
-                'Невозможно удалить пользователя, который используется'
-            ))
-            return redirect('users_index')
+    def is_in_use(self, user):
+        return user.authored_count > 0 or user.assigned_count > 0
 
 
 class UserLoginView(SuccessMessageMixin, LoginView):
     form_class = UserLoginForm
     template_name = 'users/login.html'
+    query_budget = 1
     success_message = _('Вы залогинены')
 
     def get_success_url(self):
@@ -123,13 +200,18 @@ class UserLogoutView(LogoutView):
 class StatusListView(LoginRequiredMixin, ListView):
     model = Status
     template_name = 'statuses/index.html'
+    query_budget = 2
     context_object_name = 'statuses'
 
+    def get_queryset(self):
+        return super().get_queryset().with_usage()
+
 
 class StatusCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Status
     form_class = StatusForm
     template_name = 'statuses/create.html'
+    query_budget = 1
     success_url = reverse_lazy('statuses_index')
     success_message = _('Статус успешно создан')
 
@@ -138,58 +220,224 @@ class StatusUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Status
     form_class = StatusForm
     template_name = 'statuses/update.html'
+    query_budget = 2
     success_url = reverse_lazy('statuses_index')
     success_message = _('Статус успешно изменен')
 
 
-class StatusDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class StatusDeleteView(
+    LoginRequiredMixin, SuccessMessageMixin, InUseDeleteMixin, DeleteView
+):
     model = Status
     template_name = 'statuses/delete.html'
+    query_budget = 2
     success_url = reverse_lazy('statuses_index')
     success_message = _('Статус успешно удален')
+    in_use_message = _('Невозможно удалить статус, который используется')
 
-    def post(self, request, *args, **kwargs):
-        status = self.get_object()
-        try:
-            if status.task_set.exists():
-                messages.error(request, _(
-                    'Невозможно удалить статус, который используется'
-                ))
-                return redirect('statuses_index')
+    def get_queryset(self):
+        return super().get_queryset().with_usage()
 
-            messages.success(request, self.success_message)
-            return super().post(request, *args, **kwargs)
-        except ProtectedError:
-            # ▼▼▼ ВОТ ИСПРАВЛЕННАЯ СТРОКА ▼▼▼
-            messages.error(request, _(
-                'Невозможно удалить статус, который используется'
-            ))
-            return redirect('statuses_index')
+
+def task_row_context():
+    """
+    Контекст кэша строк для шаблона tasks/row.html. Строку, прочитанную
+    с отстающей реплики, в кэш не кладём: она легла бы под ключ с уже
+    новой версией статусов и пользователей.
+    """
+    if not settings.TASK_ROW_CACHE_TIMEOUT or reads_from_replica():
+        return {'row_cache_timeout': 0}
+    return {
+        'row_version': get_row_version(),
+        'row_cache_timeout': settings.TASK_ROW_CACHE_TIMEOUT,
+    }
 
 
 class TaskListView(FilterView):
     """Список всех задач с фильтрацией"""
     model = Task
     template_name = 'tasks/index.html'
+    query_budget = 3
     context_object_name = 'tasks'
     filterset_class = TaskFilter
+    paginate_by = 20
+    page_kwarg = 'cursor'
+    cursor_ordering = ('-created_at', 'id')
+    search_ordering = ('-search_rank', 'id')
+
+    def get_queryset(self):
+        return super().get_queryset().with_relations()
+
+    def get_cursor_paginator(self, queryset):
+        if 'search_rank' in queryset.query.annotations:
+            ordering = self.search_ordering
+        else:
+            ordering = self.cursor_ordering
+        return CursorPaginator(queryset, self.paginate_by, ordering)
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_cursor_paginator(queryset)
+        page = paginator.page(self.request.GET.get(self.page_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['filter'] = self.filterset
+        context['bulk_form'] = TaskBulkForm()
+        context.update(task_row_context())
         return context
 
 
+class Echo:
+    """Буфер для csv.writer, который сразу отдаёт записанную строку"""
+
+    def write(self, value):
+        return value
+
+
+class TaskExportView(LoginRequiredMixin, View):
+    """Потоковая выгрузка отфильтрованных задач в CSV или NDJSON"""
+    query_budget = 3
+    chunk_size = 2000
+    formats = {
+        'csv': ('text/csv; charset=utf-8', 'tasks.csv'),
+        'ndjson': ('application/x-ndjson; charset=utf-8', 'tasks.ndjson'),
+    }
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in self.formats:
+            export_format = 'csv'
+        filterset = TaskFilter(
+            request.GET,
+            queryset=Task.objects.with_relations(),
+            request=request,
+        )
+        if not filterset.is_valid():
+            return JsonResponse({'errors': filterset.errors}, status=400)
+        format_rows = getattr(self, f'{export_format}_rows')
+        if isinstance(request, ASGIRequest):
+            # синхронный итератор ASGI-обработчик Django прочитал бы
+            # целиком до отправки первого байта
+            rows = self.async_rows(filterset.qs, format_rows)
+        else:
+            # iterator() читает результат порциями (серверным курсором
+            # в PostgreSQL), поэтому память не зависит от размера выгрузки
+            rows = format_rows(
+                serialize_task(task)
+                for task in filterset.qs.iterator(chunk_size=self.chunk_size)
+            )
+
+        content_type, filename = self.formats[export_format]
+        response = StreamingHttpResponse(rows, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+    async def async_rows(self, queryset, format_rows):
+        """Те же строки под ASGI: порции задач читаются aiterator()"""
+        chunk, header = [], True
+        async for task in queryset.aiterator(chunk_size=self.chunk_size):
+            chunk.append(serialize_task(task))
+            if len(chunk) == self.chunk_size:
+                for row in format_rows(chunk, header):
+                    yield row
+                chunk, header = [], False
+        for row in format_rows(chunk, header):
+            yield row
+
+    def csv_rows(self, tasks, header=True):
+        writer = csv.writer(Echo())
+        if header:
+            yield writer.writerow(TASK_FIELDS)
+        for task in tasks:
+            task['labels'] = ', '.join(task['labels'])
+            yield writer.writerow([task[field] for field in TASK_FIELDS])
+
+    def ndjson_rows(self, tasks, header=True):
+        for task in tasks:
+            yield json.dumps(task, ensure_ascii=False) + '\n'
+
+
+class TaskApiListView(LoginRequiredMixin, View):
+    """JSON-список задач с фильтрами TaskFilter и курсорной пагинацией"""
+    query_budget = 3
+    paginate_by = 50
+
+    @method_decorator(condition(
+        etag_func=tasks_etag, last_modified_func=tasks_last_modified
+    ))
+    def get(self, request, *args, **kwargs):
+        filterset = TaskFilter(
+            request.GET,
+            queryset=Task.objects.with_relations(),
+            request=request,
+        )
+        if not filterset.is_valid():
+            return JsonResponse({'errors': filterset.errors}, status=400)
+        queryset = filterset.qs
+        if 'search_rank' in queryset.query.annotations:
+            ordering = TaskListView.search_ordering
+        else:
+            ordering = TaskListView.cursor_ordering
+        paginator = CursorPaginator(queryset, self.paginate_by, ordering)
+        page = paginator.page(request.GET.get('cursor'))
+        return JsonResponse({
+            'results': [serialize_task(task) for task in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+        })
+
+
+class TaskChangesView(LoginRequiredMixin, View):
+    """
+    Лента изменений задач после курсора since: изменённые задачи
+    целиком и id удалённых. Клиент хранит next и передаёт его в
+    следующем запросе; без since лента начинается с начала.
+    """
+    query_budget = 4
+    paginate_by = 200
+
+    def get(self, request, *args, **kwargs):
+        try:
+            changes = changes_since(request.GET.get('since'), self.paginate_by)
+        except InvalidToken:
+            return JsonResponse(
+                {'errors': {'since': [_('Некорректный курсор изменений')]}},
+                status=400,
+            )
+        changes['changed'] = [serialize_task(task) for task in changes['changed']]
+        return JsonResponse(changes)
+
+
+class TaskApiDetailView(LoginRequiredMixin, View):
+    """JSON-карточка задачи"""
+    query_budget = 3
+
+    @method_decorator(condition(
+        etag_func=tasks_etag, last_modified_func=tasks_last_modified
+    ))
+    def get(self, request, pk, *args, **kwargs):
+        task = get_object_or_404(Task.objects.with_relations(), pk=pk)
+        return JsonResponse(serialize_task(task))
+
+
 class TaskDetailView(LoginRequiredMixin, DetailView):
     model = Task
     template_name = 'tasks/detail.html'
+    query_budget = 3
     context_object_name = 'task'
 
+    def get_queryset(self):
+        return super().get_queryset().with_relations()
+
 
 class TaskCreateView(SuccessMessageMixin, CreateView):
     model = Task
     form_class = TaskForm
     template_name = 'tasks/create.html'
+    query_budget = 1
     success_url = reverse_lazy('tasks_index')
     success_message = _('Задача успешно создана')
 
@@ -206,6 +454,7 @@ class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Task
     form_class = TaskForm
     template_name = 'tasks/update.html'
+    query_budget = 5
     success_url = reverse_lazy('tasks_index')
     success_message = _('Задача успешно изменена')
 
@@ -213,34 +462,81 @@ class TaskUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
 class TaskDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
     model = Task
     template_name = 'tasks/delete.html'
+    query_budget = 2
     success_url = reverse_lazy('tasks_index')
     success_message = _('Задача успешно удалена')
 
+    def get_object(self, queryset=None):
+        # get и post проверяют автора, а затем DeleteView снова
+        # запрашивает объект — достаточно одного запроса
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def get(self, request, *args, **kwargs):
         task = self.get_object()
-        if request.user != task.author:
+        if task.author_id != request.user.id:
             messages.error(request, _('Задачу может удалить только ее автор'))
             return redirect('tasks_index')
         return super().get(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         task = self.get_object()
-        if request.user != task.author:
+        if task.author_id != request.user.id:
             messages.error(request, _('Задачу может удалить только ее автор'))
             return redirect('tasks_index')
         return super().post(request, *args, **kwargs)
 
 
+class TaskBulkView(LoginRequiredMixin, View):
+    """
+    Массовое изменение задач, отмеченных в списке, или всех задач
+    по фильтру из параметров адреса — одной транзакцией (bulk.py).
+    """
+    http_method_names = ['post']
+
+    def post(self, request, *args, **kwargs):
+        redirect_url = reverse('tasks_index')
+        if request.GET:
+            redirect_url += '?' + request.GET.urlencode()
+        form = TaskBulkForm(request.POST)
+        if not form.is_valid():
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+            return redirect(redirect_url)
+        if form.cleaned_data['select_all']:
+            filterset = TaskFilter(
+                request.GET, queryset=Task.objects.all(), request=request
+            )
+            if not filterset.is_valid():
+                messages.error(request, _('Некорректный фильтр задач'))
+                return redirect(redirect_url)
+            tasks = filterset.qs
+        else:
+            tasks = Task.objects.filter(pk__in=form.cleaned_data['tasks'])
+        count = form.apply(tasks)
+        messages.success(
+            request, _('Изменено задач: %(count)s') % {'count': count}
+        )
+        return redirect(redirect_url)
+
+
 class LabelListView(LoginRequiredMixin, ListView):
     model = Label
     template_name = 'labels/index.html'
+    query_budget = 2
     context_object_name = 'labels'
 
+    def get_queryset(self):
+        return super().get_queryset().with_usage()
+
 
 class LabelCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
     model = Label
     form_class = LabelForm
     template_name = 'labels/create.html'
+    query_budget = 1
     success_url = reverse_lazy('labels_index')
     success_message = _('Метка успешно создана')
 
@@ -249,28 +545,245 @@ class LabelUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
     model = Label
     form_class = LabelForm
     template_name = 'labels/update.html'
+    query_budget = 2
     success_url = reverse_lazy('labels_index')
     success_message = _('Метка успешно изменена')
 
 
-class LabelDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
+class LabelDeleteView(
+    LoginRequiredMixin, SuccessMessageMixin, InUseDeleteMixin, DeleteView
+):
     model = Label
     template_name = 'labels/delete.html'
+    query_budget = 2
     success_url = reverse_lazy('labels_index')
     success_message = _('Метка успешно удалена')
+    in_use_message = _('Невозможно удалить метку, связанную с задачами')
 
-    def post(self, request, *args, **kwargs):
-        label = self.get_object()
+    def get_queryset(self):
+        return super().get_queryset().with_usage()
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    """Поиск вариантов выбора по префиксу для виджетов автодополнения"""
+    model = None
+    search_fields = ()
+    limit = 20
+
+    def get_queryset(self):
+        return self.model.objects.order_by(self.search_fields[0])
+
+    def label(self, obj):
+        return str(obj)
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        term = request.GET.get('q', '').strip()
+        if term:
+            vendor = connections[queryset.db].vendor
+            condition = Q()
+            for field in self.search_fields:
+                condition |= prefix_q(field, term, vendor)
+            queryset = queryset.filter(condition)
+        results = [
+            {'id': obj.pk, 'text': self.label(obj)}
+            for obj in queryset[:self.limit]
+        ]
+        return JsonResponse({'results': results})
+
+
+class UserAutocompleteView(AutocompleteView):
+    model = User
+    query_budget = 2
+    search_fields = ('username', 'first_name', 'last_name')
+
+    def get_queryset(self):
+        return super().get_queryset().only(
+            'username', 'first_name', 'last_name'
+        )
+
+    def label(self, obj):
+        return user_label(obj)
+
+
+class LabelAutocompleteView(AutocompleteView):
+    model = Label
+    query_budget = 2
+    search_fields = ('name',)
+
+
+# Асинхронные версии представлений чтения. Подключаются в urls.py
+# при ASYNC_VIEWS=true (запуск под ASGI): данные читаются async ORM,
+# а шаблон Django рендерит в потоке, как любой TemplateResponse.
+
+class AsyncViewMixin:
+    """
+    Загружает пользователя через request.auser() и подменяет им
+    ленивый request.user, чтобы проверки доступа, фильтры и шаблоны
+    не обращались к базе синхронно из цикла событий.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        # LoginRequiredMixin отвечает редиректом сразу, без корутины
+        response = super().dispatch(request, *args, **kwargs)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+
+class AsyncListMixin(AsyncViewMixin):
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = [obj async for obj in self.get_queryset()]
+        return self.render_to_response(self.get_context_data())
+
+
+class AsyncUserListView(AsyncListMixin, UserListView):
+    pass
+
+
+class AsyncStatusListView(AsyncListMixin, StatusListView):
+    pass
+
+
+class AsyncLabelListView(AsyncListMixin, LabelListView):
+    pass
+
+
+class AsyncTaskDetailView(AsyncViewMixin, TaskDetailView):
+
+    async def get(self, request, *args, **kwargs):
         try:
-            if label.tasks.exists():
-                messages.error(request, _(
-                    'Невозможно удалить метку, связанную с задачами'
-                ))
-                return redirect('labels_index')
-            messages.success(request, self.success_message)
-            return super().post(request, *args, **kwargs)
-        except ProtectedError:
-            messages.error(request, _(
-                'Невозможно удалить метку, связанную с задачами'
-            ))
-            return redirect('labels_index')
\ No newline at end of file
+            self.object = await self.get_queryset().aget(
+                pk=self.kwargs[self.pk_url_kwarg]
+            )
+        except Task.DoesNotExist:
+            raise Http404(_('Задача не найдена'))
+        return self.render_to_response(
+            self.get_context_data(object=self.object)
+        )
+
+
+class AsyncTaskListView(AsyncViewMixin, TaskListView):
+
+    async def get(self, request, *args, **kwargs):
+        # форма фильтра проверяет значения запросами к базе
+        queryset = await sync_to_async(self.filter_tasks)()
+        self.paginator = self.get_cursor_paginator(queryset)
+        self.page = await self.paginator.apage(
+            request.GET.get(self.page_kwarg)
+        )
+        self.object_list = queryset
+        return self.render_to_response(
+            self.get_context_data(filter=self.filterset, object_list=queryset)
+        )
+
+    def filter_tasks(self):
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if (
+            not self.filterset.is_bound
+            or self.filterset.is_valid()
+            or not self.get_strict()
+        ):
+            return self.filterset.qs
+        return self.filterset.queryset.none()
+
+    def paginate_queryset(self, queryset, page_size):
+        page = self.page
+        return self.paginator, page, page.object_list, page.has_other_pages()
+
+
+def sse_message(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def release_connections():
+    """
+    Закрывает соединения с БД потока запроса (с пулом — возвращает
+    в пул). close_old_connections() здесь не годится: при CONN_MAX_AGE
+    живое соединение осталось бы за открытым потоком SSE.
+    """
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+class TaskEventsView(AsyncViewMixin, LoginRequiredMixin, View):
+    """
+    Поток Server-Sent Events для списка задач: изменения задач,
+    подходящих под фильтр из параметров запроса. upsert несёт готовую
+    строку таблицы, remove — id строки, которую нужно убрать.
+    Работает под ASGI; под WSGI поток занял бы поток воркера, поэтому
+    там ответ 204, после которого EventSource не переподключается.
+    """
+    query_budget = 2
+    retry_ms = 5000
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        tasks = await sync_to_async(self.filter_tasks)()
+        response = StreamingHttpResponse(
+            self.stream(tasks), content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def filter_tasks(self):
+        filterset = TaskFilter(
+            self.request.GET,
+            queryset=Task.objects.select_related('status', 'author', 'executor'),
+            request=self.request,
+        )
+        if filterset.is_valid():
+            return filterset.qs
+        return Task.objects.none()
+
+    async def stream(self, tasks):
+        subscription = get_broker().subscribe()
+        try:
+            # соединение, взятое для проверки фильтра, не держим,
+            # пока поток ждёт событий
+            await sync_to_async(release_connections)()
+            yield f'retry: {self.retry_ms}\n\n'
+            while True:
+                try:
+                    batch = await asyncio.wait_for(
+                        subscription.get(), settings.TASK_EVENTS_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if subscription.overflowed:
+                    # часть событий потеряна — странице проще перезагрузиться
+                    yield sse_message('reload', {})
+                    return
+                messages = await sync_to_async(self.messages)(
+                    tasks, coalesce(batch)
+                )
+                for message in messages:
+                    yield message
+        finally:
+            subscription.close()
+
+    def messages(self, tasks, batch):
+        """Сообщения пачки событий: одна выборка задач на всю пачку"""
+        ids = [pk for pk, kind in batch.items() if kind != DELETED]
+        found = {task.pk: task for task in tasks.filter(pk__in=ids)}
+        messages = []
+        for pk, kind in batch.items():
+            task = found.get(pk)
+            if task is not None:
+                html = render_to_string(
+                    'tasks/row.html', {'task': task, **task_row_context()}
+                )
+                messages.append(sse_message('upsert', {
+                    'id': pk, 'created': kind == CREATED, 'html': html,
+                }))
+            elif kind != CREATED:
+                # задача удалена или больше не подходит под фильтр
+                messages.append(sse_message('remove', {'id': pk}))
+        release_connections()
+        return messages
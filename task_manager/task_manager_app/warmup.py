@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+
+
+def template_names(engine):
+    """Имена всех шаблонов в каталогах загрузчиков движка"""
+    names = set()
+    for loader in engine.template_loaders:
+        for directory in loader.get_dirs():
+            directory = Path(directory)
+            names.update(
+                path.relative_to(directory).as_posix()
+                for path in directory.rglob('*')
+                if path.suffix in TEMPLATE_SUFFIXES and path.is_file()
+            )
+    return sorted(names)
+
+
+def warm_templates():
+    """
+    Компилирует все шаблоны в кэш загрузчика (cached.Loader), чтобы
+    первый запрос к новому воркеру не разбирал их сам. Вызывается из
+    wsgi.py и asgi.py; возвращает число скомпилированных шаблонов.
+    """
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in template_names(backend.engine):
+            try:
+                backend.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                # шаблоны библиотек для приложений вне INSTALLED_APPS
+                continue
+            count += 1
+    return count
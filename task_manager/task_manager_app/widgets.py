@@ -0,0 +1,45 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """
+    Виджет выбора, который рисует на сервере только выбранные варианты,
+    а остальные подгружает из JSON-эндпоинта по мере ввода.
+    """
+
+    class Media:
+        js = ['task_manager_app/autocomplete.js']
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        attrs = {**(attrs or {}), 'data-autocomplete-url': reverse(self.url_name)}
+        return super().get_context(name, value, attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        iterator = self.choices
+        choices = []
+        if iterator.field.empty_label is not None:
+            choices.append(('', iterator.field.empty_label))
+        selected = [pk for pk in value if str(pk).isdigit()]
+        if selected:
+            choices.extend(
+                iterator.choice(obj)
+                for obj in iterator.queryset.filter(pk__in=selected)
+            )
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = iterator
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass